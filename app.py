@@ -1,4 +1,6 @@
 import argparse
+import contextlib
+import json
 import sys
 import time
 import threading
@@ -6,12 +8,16 @@ import multiprocessing
 from dotenv import load_dotenv
 
 # Import refactored modules using absolute imports from the 'miner' package
+from miner.benchmark import MiningBenchmark
+from miner.calibration import Calibrator
 from miner.config import MinerConfig
 from miner.logger import Logger
 from miner.session_manager import SessionManager
+from miner.target import format_difficulty
 from miner.api_handler import ApiHandler
 from miner.miner_core import MinerCore
 from miner.stats_monitor import StatsMonitor
+from miner.submitter import BlockSubmitter
 
 # Load environment variables at the very beginning
 load_dotenv()
@@ -37,7 +43,10 @@ class PhonesiumMinerApp:
             'blocks_mined': 0,
             'total_hashes': 0,
             'start_time': time.time(),
-            'hash_rate': 0,
+            'hash_rate': 0, # 10 s window of the measured hash rate
+            'hash_rate_60s': 0,
+            'hash_rate_15m': 0,
+            'worker_hash_rates': [], # Per-worker 60 s rates
             'accepted_blocks': 0,
             'rejected_blocks': 0,
             'network_errors': 0,
@@ -47,15 +56,28 @@ class PhonesiumMinerApp:
             'best_hash_rate': 0,
             'average_block_time': 0,
             'cpu_usage': 0,
+            'worker_cpu_percent': 0, # Measured CPU per hashing worker, held at CPU_LIMIT by the throttle
             'memory_usage': 0,
             'temperature': 0, # Placeholder, requires platform-specific libraries
             'power_level': 'low',
-            'session_uptime': 0
+            'session_uptime': 0,
+            'stop_latency_ms': 0, # Time for all workers to stop after a job ends
+            'max_stop_latency_ms': 0,
+            'duplicate_hashes': 0, # Hashes of nonces that were already hashed for the same job
+            'worker_idle_seconds': 0.0, # Time workers sat without nonces while their job was still running
+            'extranonce_rolls': 0, # Times a job's nonce space was used up and its template rolled in place
+            'submit_queue_depth': 0, # Solutions waiting for the background submitter
+            'submit_latency_ms': 0, # Time from queuing a solution to the server's answer
+            'max_submit_latency_ms': 0,
+            'submit_drops': 0 # Solutions dropped because the submission queue was full
         }
         self.stats_lock = threading.Lock() # Protects access to self.stats
         
         self.miner_core = MinerCore(self.config, self.logger, self.stats_lock, self.stats)
-        self.stats_monitor = StatsMonitor(self.config, self.logger, self.stats_lock, self.stats)
+        self.submitter = BlockSubmitter(self.config, self.logger, self.api_handler, self.session_manager, self.stats_lock, self.stats,
+                                        self.miner_core.hash_rate_meter)
+        self.stats_monitor = StatsMonitor(self.config, self.logger, self.stats_lock, self.stats,
+                                          self.miner_core.hash_counter, self.miner_core.hash_rate_meter)
 
         # Signal handlers for graceful shutdown
         import signal
@@ -68,6 +90,7 @@ class PhonesiumMinerApp:
         self.shutdown_requested = True
         self.mining = False
         self.miner_core.shutdown_requested = True
+        self.miner_core.preempt()
         self.stats_monitor.running = False
 
     def display_banner(self):
@@ -78,10 +101,10 @@ class PhonesiumMinerApp:
             print(f"{'='*70}")
             print(f"👤 User: {self.username} (ID: {self.user_id})")
             print(f"🧵 Threads: {self.config.threads} / {multiprocessing.cpu_count()} available")
-            print(f"💎 Difficulty: {self.config.difficulty} leading zeros")
+            print(f"💎 Difficulty: {format_difficulty(self.config.difficulty, self.config.difficulty_mode)}")
             print(f"🌐 Server: {self.config.base_url}")
             print(f"⚡ Target Rate: ~{self.config.nonce_range * self.config.threads:,} H/s")
-            print(f"🔧 Auto Difficulty: {'ON' if self.config.auto_difficulty else 'OFF'}")
+            print(f"🔧 Auto Difficulty: {f'ON (~{self.config.target_block_time:.0f}s per block)' if self.config.auto_difficulty else 'OFF'}")
             print(f"🎯 CPU Limit: {self.config.cpu_limit}%")
             print(f"💾 Memory Limit: {self.config.memory_limit}MB")
             print(f"{'='*70}")
@@ -157,6 +180,7 @@ class PhonesiumMinerApp:
         """Pauses the mining process."""
         self.paused = True
         self.miner_core.paused = True
+        self.miner_core.preempt()
         self.logger.log('WARNING', "Mining paused")
 
     def resume_mining(self):
@@ -165,6 +189,15 @@ class PhonesiumMinerApp:
         self.miner_core.paused = False
         self.logger.log('INFO', "Mining resumed")
 
+    def _queue_solution(self, result):
+        """Hands a found block to the background submitter; hashing moves straight on."""
+        system_info = {
+            'threads': self.config.threads,
+            'cpu_usage': self.stats.get('cpu_usage', 0),
+            'memory_usage': self.stats.get('memory_usage', 0)
+        }
+        self.submitter.enqueue(self.user_id, self.username, result, system_info)
+
     def start_mining(self):
         """Starts the main mining loop and background monitors."""
         self.display_banner()
@@ -180,8 +213,7 @@ class PhonesiumMinerApp:
         performance_thread = threading.Thread(target=self.stats_monitor.monitor_system_performance, daemon=True)
         performance_thread.start()
         
-        consecutive_failures = 0
-        max_consecutive_failures = 5
+        self.submitter.start()
         
         try:
             while self.mining and not self.shutdown_requested:
@@ -193,65 +225,23 @@ class PhonesiumMinerApp:
                     block_data = self.miner_core.generate_block_data(self.user_id)
                     self.logger.log('INFO', "Starting mining job...")
                     
-                    result = self.miner_core.mine_block(block_data)
-                    
-                    if result and self.mining and not self.shutdown_requested:
-                        system_info = {
-                            'threads': self.config.threads,
-                            'cpu_usage': self.stats.get('cpu_usage', 0),
-                            'memory_usage': self.stats.get('memory_usage', 0)
-                        }
-                        submit_result = self.api_handler.submit_block(
-                            self.user_id, result['hash'], result['nonce'], self.config.difficulty,
-                            int(self.stats.get('hash_rate', 0)), system_info
-                        )
-                        
-                        if submit_result.get('success'):
-                            consecutive_failures = 0
-                            with self.stats_lock:
-                                self.stats['accepted_blocks'] += 1
-                                self.stats['blocks_mined'] += 1
-                                self.stats['last_block_time'] = time.time()
-                                self.stats['total_earnings'] += float(submit_result['data'].get('final_reward', 0))
-                                self.stats['current_balance'] = float(submit_result['data'].get('new_balance', 0))
-                                self.stats['power_level'] = submit_result['data'].get('power_level', 'low')
-                                if self.stats['accepted_blocks'] > 1:
-                                    elapsed = time.time() - self.stats['start_time']
-                                    self.stats['average_block_time'] = elapsed / self.stats['accepted_blocks']
-                            
-                            # Enhanced logging for accepted block
-                            reward = submit_result['data'].get('final_reward', 0)
-                            balance = submit_result['data'].get('new_balance', 0)
-                            block_num = submit_result['data'].get('block_number', 0)
-                            power_level = submit_result['data'].get('power_level', 'unknown')
-                            
-                            success_rate = (self.stats['accepted_blocks'] / 
-                                            (self.stats['accepted_blocks'] + self.stats['rejected_blocks']) * 100) if (self.stats['accepted_blocks'] + self.stats['rejected_blocks']) > 0 else 100
-                            
-                            self.logger.log('SUCCESS', 
-                                            f"Accepted {self.stats['accepted_blocks']}/{self.stats['accepted_blocks'] + self.stats['rejected_blocks']} "
-                                            f"({success_rate:.1f}%) ∙ +{reward} PHN ∙ Balance: {balance} PHN ∙ "
-                                            f"Block #{block_num} ∙ Power: {power_level.upper()}")
-                            
-                            self.session_manager.save_session_cache(self.user_id, self.username, self.stats)
-                            time.sleep(1) # Brief pause before next block
-                        else:
-                            with self.stats_lock:
-                                self.stats['rejected_blocks'] += 1
-                                if submit_result.get('retryable', True): # Increment network errors only if retryable
-                                    self.stats['network_errors'] += 1
-                            consecutive_failures += 1
-                            self.logger.log('WARNING', f"Block submission failed ({consecutive_failures}/{max_consecutive_failures}): {submit_result.get('error', 'Unknown')}")
-                            time.sleep(2)
+                    if self.config.continuous_mining:
+                        # Every solution of the template is queued while the workers keep searching it
+                        for result in self.miner_core.iter_solutions(block_data):
+                            if not self.mining or self.shutdown_requested:
+                                break
+                            self._queue_solution(result)
                     else:
-                        if not self.shutdown_requested and not self.paused:
-                            self.logger.log('INFO', "No solution found, generating new job...")
-                            time.sleep(1)
-                        
-                    if consecutive_failures >= max_consecutive_failures:
+                        result = self.miner_core.mine_block(block_data)
+                        if result and self.mining and not self.shutdown_requested:
+                            self._queue_solution(result)
+                    # No result means the job timed out (MinerCore logs that) or was preempted. Nonce
+                    # exhaustion no longer ends a job, so the next template starts without a pause.
+                    
+                    if self.submitter.failing():
                         self.logger.log('ERROR', "Too many consecutive failures, pausing for 30 seconds...")
                         time.sleep(30)
-                        consecutive_failures = 0
+                        self.submitter.reset_failures()
                         
                 except Exception as e:
                     self.logger.log('ERROR', f"Mining loop error: {e}")
@@ -269,12 +259,43 @@ class PhonesiumMinerApp:
             self.miner_core.mining_active = False
             self.stats_monitor.running = False
             self.logger.log('INFO', "Stopping mining threads and monitors...")
+            self.miner_core.shutdown()
+            self.submitter.stop() # Pending solutions still get submitted
             time.sleep(2) # Give threads a moment to shut down
             
             self.stats_monitor.print_stats()
             self.session_manager.save_session_cache(self.user_id, self.username, self.stats)
             self.logger.log('SUCCESS', "Mining session ended. Thank you for mining Phonesium!")
 
+def run_benchmark(app: PhonesiumMinerApp, args):
+    """Runs the offline benchmark (no login, no server) and emits its JSON report."""
+    try:
+        worker_counts = [int(count) for count in args.benchmark_workers.split(',')] if args.benchmark_workers else None
+        backends = [backend.strip() for backend in args.benchmark_backends.split(',') if backend.strip()]
+        if any(backend not in ('thread', 'process') for backend in backends) or any(count < 1 for count in worker_counts or []):
+            raise ValueError("use backends thread/process and worker counts >= 1")
+    except ValueError as e:
+        print(f"Configuration error: invalid benchmark sweep ({e})")
+        sys.exit(1)
+    
+    # Keep stdout clean for the JSON report; progress logs go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            report = MiningBenchmark(app.config, app.logger, app.miner_core).run(
+                args.benchmark_seconds, app.config.difficulty if args.difficulty else None, app.config.difficulty_mode,
+                backends, worker_counts)
+        finally:
+            app.miner_core.shutdown()
+            app.miner_core.release_single_instance_lock()
+    
+    output = json.dumps(report, indent=2)
+    if args.benchmark_output:
+        with open(args.benchmark_output, 'w') as f:
+            f.write(output + "\n")
+        app.logger.log('SUCCESS', f"Benchmark report written to {args.benchmark_output}")
+    else:
+        print(output)
+
 def main():
     """Main entry point for the Phonesium Mining Client."""
     parser = argparse.ArgumentParser(
@@ -282,8 +303,17 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""Examples:
 python app.py                          # Interactive login
-python app.py --threads 8              # Use 8 threads
-python app.py --difficulty 6           # Set difficulty to 6
+python app.py --threads 8              # Use up to 8 threads
+python app.py --no-calibrate           # Use the configured settings as they are
+python app.py --recalibrate            # Measure again instead of using the cached profile
+python app.py --backend process        # Hash in worker processes
+python app.py --affinity skip-core-0   # Pin workers, keep core 0 free
+python app.py --priority idle          # Hash only when the CPU is otherwise idle
+python app.py --difficulty 6           # Set difficulty to 6 leading zeros
+python app.py --difficulty 22b         # Set difficulty to 22 leading zero bits
+python app.py --auto-difficulty --target-block-time 30  # Aim for a block every ~30s
+python app.py --continuous             # Submit every solution of each template
+python app.py --benchmark --benchmark-workers 1,2,4  # Offline throughput benchmark (JSON)
 python app.py --user-id 123 --username miner1  # Skip login
 python app.py --clear-cache            # Clear session cache
 python app.py --url https://myserver.com  # Custom server
@@ -293,20 +323,43 @@ python app.py --url https://myserver.com  # Custom server
     parser.add_argument('--user-id', type=int, help='User ID (skip login)')
     parser.add_argument('--username', help='Username (with --user-id)')
     parser.add_argument('--threads', type=int, help='Number of mining threads')
-    parser.add_argument('--difficulty', type=int, help='Mining difficulty (leading zeros)')
+    parser.add_argument('--difficulty', help='Mining difficulty: leading zeros (6), zero bits (22b) or a target (0x00000fff...)')
     parser.add_argument('--clear-cache', action='store_true', help='Clear session cache')
     parser.add_argument('--url', help='Custom base URL (e.g., https://shp.re)')
     parser.add_argument('--auto-difficulty', action='store_true', help='Enable auto difficulty adjustment')
+    parser.add_argument('--target-block-time', type=float, help='Seconds per block auto difficulty aims for')
+    parser.add_argument('--continuous', action='store_true', help='Keep mining each template after a solution and submit every one')
+    parser.add_argument('--no-calibrate', action='store_true', help='Skip the startup calibration of threads and batch size')
+    parser.add_argument('--recalibrate', action='store_true', help='Ignore the cached calibration profile and measure again')
     parser.add_argument('--cpu-limit', type=int, help='CPU usage limit percentage (1-100)')
+    parser.add_argument('--backend', choices=['auto', 'thread', 'process'],
+                        help='Hashing backend (process avoids the GIL; auto uses threads on free-threaded Python)')
+    parser.add_argument('--affinity', help='Pin workers to CPUs: none, physical, skip-core-0 or a CPU list like 2,3,6-7')
+    parser.add_argument('--priority', choices=['idle', 'low', 'normal'], help='Scheduling priority of the hashing workers (idle = SCHED_IDLE; threads only on free-threaded Python)')
+    parser.add_argument('--hash-kernel', choices=['auto', 'hashlib', 'numpy'], help='Batch hashing kernel (auto probes which is faster)')
+    parser.add_argument('--benchmark', action='store_true', help='Run the offline throughput benchmark, print JSON and exit')
+    parser.add_argument('--benchmark-seconds', type=float, default=3.0, help='Hashing time per benchmark run')
+    parser.add_argument('--benchmark-workers', help='Comma-separated worker counts to sweep (default 1, 2, 4, ... up to --threads)')
+    parser.add_argument('--benchmark-backends', default='thread,process', help='Comma-separated backends to sweep')
+    parser.add_argument('--benchmark-output', help='Write the benchmark JSON to this file instead of stdout')
     parser.add_argument('--log-file', action='store_true', help='Enable logging to file')
     parser.add_argument('--version', action='version', version='Phonesium Miner v2.0')
     
     args = parser.parse_args()
     
-    app = PhonesiumMinerApp()
+    try:
+        # With --benchmark stdout carries only the JSON report, so startup logs go to stderr
+        with contextlib.redirect_stdout(sys.stderr) if args.benchmark else contextlib.nullcontext():
+            app = PhonesiumMinerApp()
+            # Apply command line arguments to config
+            app.config.update_from_args(args)
+    except ValueError as e:
+        print(f"Configuration error: {e}")
+        sys.exit(1)
     
-    # Apply command line arguments to config
-    app.config.update_from_args(args)
+    if args.benchmark:
+        run_benchmark(app, args)
+        return
     
     if args.clear_cache:
         app.session_manager.clear_session_cache()
@@ -327,6 +380,10 @@ python app.py --url https://myserver.com  # Custom server
             app.logger.log('ERROR', "Authentication failed")
             sys.exit(1)
     
+    # Tune threads, batch size and nonce range for this host before mining
+    if app.config.calibrate and not app.shutdown_requested:
+        Calibrator(app.config, app.logger, app.miner_core).calibrate(force=app.config.recalibrate)
+    
     # Start mining
     try:
         app.start_mining()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hash rate of a worker pool under each CPU placement policy.
+Usage: python benchmarks/bench_affinity.py [--workers 4] [--seconds 5] [--backend process] [--policies none,physical,skip-core-0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miner.affinity import available_cpus, plan_affinity
+from miner.process_backend import ProcessMiningBackend
+from miner.thread_backend import ThreadMiningBackend
+from miner.work_unit import run_work_unit
+
+BLOCK_DATA = "phonesium_1700000000_4821937_123_654321"
+UNREACHABLE_DIFFICULTY = 64 # All-zero sha256 digest, so workers hash for the whole run
+BATCH_SIZE = 50000
+
+def run_policy(backend_kind: str, policy: str, workers: int, seconds: float) -> float:
+    """Runs one pool pinned by `policy` for `seconds` and returns the measured H/s."""
+    def thread_unit(unit, worker_id, generation, dispenser, report, throttle):
+        """Thread work function: the same unit loop the worker processes run."""
+        run_work_unit(unit, worker_id, generation, dispenser, BATCH_SIZE, backend.hash_slots, report, throttle)
+
+    cpus = plan_affinity(policy, workers)
+    if backend_kind == 'process':
+        backend = ProcessMiningBackend(workers, BATCH_SIZE, cpus)
+    else:
+        backend = ThreadMiningBackend(workers, thread_unit, cpus)
+    backend.start()
+    try:
+        job_id = backend.start_job(BLOCK_DATA, 'sha256', 'hashlib', UNREACHABLE_DIFFICULTY, 10 ** 12, 100)
+        start_time = time.perf_counter()
+        time.sleep(seconds)
+        hashes = sum(backend.hash_slots)
+        elapsed = time.perf_counter() - start_time
+        backend.cancel_job()
+        pending = workers
+        while pending:
+            message = backend.get_message(timeout=2)
+            if message is None:
+                break
+            if message[0] == 'done' and message[2] == job_id:
+                pending -= 1
+        return hashes / elapsed
+    finally:
+        backend.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description='CPU affinity placement benchmark')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='Number of hashing workers')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Hashing time per policy')
+    parser.add_argument('--backend', choices=['thread', 'process'], default='process', help='Worker pool to benchmark')
+    parser.add_argument('--policies', default='none,physical,skip-core-0',
+                        help='Comma-separated policies; CPU lists use ":" instead of "," (e.g. 2:3:6-7)')
+    args = parser.parse_args()
+
+    print(f"{args.workers} {args.backend} workers, {args.seconds:.0f}s per policy, CPUs available: {available_cpus()}")
+    baseline = None
+    for policy in args.policies.split(','):
+        policy = policy.replace(':', ',')
+        rate = run_policy(args.backend, policy, args.workers, args.seconds)
+        baseline = baseline or rate
+        print(f"{policy:<14} {str(plan_affinity(policy, args.workers)):<24} {rate:>12,.0f} H/s  ({rate / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full rehash vs. single-level prefix midstate vs. two-level midstate tree.
+Usage: python benchmarks/bench_midstate.py [--nonce-range 2000000]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miner.hash_engine import HashEngine
+from miner.hashers import resolve_hasher
+
+BLOCK_DATA = "phonesium_1700000000_4821937_123_654321"
+
+def bench_full_rehash(start_nonce: int, end_nonce: int) -> int:
+    """Original path: format and hash the whole message for every nonce."""
+    zeros = 0
+    for nonce in range(start_nonce, end_nonce):
+        if hashlib.sha256(f"{BLOCK_DATA}{nonce}".encode('utf-8')).hexdigest().startswith('0'):
+            zeros += 1
+    return zeros
+
+def bench_single_level(start_nonce: int, end_nonce: int) -> int:
+    """Prefix midstate only: copy the prefix state and feed every nonce's digits."""
+    engine = HashEngine(BLOCK_DATA, resolve_hasher('sha256'))
+    zeros = 0
+    for nonce in range(start_nonce, end_nonce):
+        if engine.hexdigest(nonce).startswith('0'):
+            zeros += 1
+    return zeros
+
+def bench_two_level(start_nonce: int, end_nonce: int) -> int:
+    """Midstate tree: copy the per-block state and feed only the low-order digits."""
+    engine = HashEngine(BLOCK_DATA, resolve_hasher('sha256'))
+    zeros = 0
+    for first_nonce, block_state, suffixes in engine.iter_blocks(start_nonce, end_nonce):
+        copy_state = block_state.copy
+        for suffix in suffixes:
+            hasher = copy_state()
+            hasher.update(suffix)
+            if hasher.hexdigest().startswith('0'):
+                zeros += 1
+    return zeros
+
+def main():
+    parser = argparse.ArgumentParser(description='Midstate caching benchmark')
+    parser.add_argument('--nonce-range', type=int, default=int(os.getenv('NONCE_RANGE', 2000000)),
+                        help='Number of nonces hashed per variant')
+    parser.add_argument('--start-nonce', type=int, default=0, help='First nonce of the range')
+    args = parser.parse_args()
+
+    start_nonce = args.start_nonce
+    end_nonce = start_nonce + args.nonce_range
+    variants = [
+        ('full rehash', bench_full_rehash),
+        ('single-level midstate', bench_single_level),
+        ('two-level midstate', bench_two_level),
+    ]
+
+    print(f"Hashing {args.nonce_range:,} nonces per variant (sha256)")
+    results = {}
+    for name, func in variants:
+        start_time = time.perf_counter()
+        zeros = func(start_nonce, end_nonce)
+        elapsed = time.perf_counter() - start_time
+        results[name] = elapsed
+        print(f"{name:<24} {elapsed:8.3f}s  {args.nonce_range / elapsed:>12,.0f} H/s  (check: {zeros})")
+
+    gain = results['single-level midstate'] / results['two-level midstate']
+    print(f"Two-level speedup over single-level: {gain:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: locking a shared stats dict for every hash vs. striped per-worker counters.
+Usage: python benchmarks/bench_stats_contention.py [--threads 8] [--hashes-per-thread 250000]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miner.hash_counter import HashCounter
+from miner.hash_engine import HashEngine
+from miner.hashers import resolve_hasher
+
+BLOCK_DATA = "phonesium_1700000000_4821937_123_654321"
+
+def locked_worker(worker_id: int, hashes: int, stats: dict, stats_lock: threading.Lock):
+    """Old path: take the shared stats lock for every hash."""
+    engine = HashEngine(BLOCK_DATA, resolve_hasher('sha256'))
+    start_nonce = worker_id * hashes
+    for first_nonce, block_state, suffixes in engine.iter_blocks(start_nonce, start_nonce + hashes):
+        copy_state = block_state.copy
+        for suffix in suffixes:
+            hasher = copy_state()
+            hasher.update(suffix)
+            hasher.digest()
+            with stats_lock:
+                stats['total_hashes'] += 1
+
+def striped_worker(worker_id: int, hashes: int, hash_counter: HashCounter):
+    """New path: count locally and flush to the worker's own slot once per nonce block."""
+    engine = HashEngine(BLOCK_DATA, resolve_hasher('sha256'))
+    start_nonce = worker_id * hashes
+    for first_nonce, block_state, suffixes in engine.iter_blocks(start_nonce, start_nonce + hashes):
+        copy_state = block_state.copy
+        for suffix in suffixes:
+            hasher = copy_state()
+            hasher.update(suffix)
+            hasher.digest()
+        hash_counter.add(worker_id, len(suffixes))
+
+def run_threads(target, threads: int, args_for) -> float:
+    """Runs `threads` workers to completion and returns the elapsed wall time."""
+    workers = [threading.Thread(target=target, args=args_for(i)) for i in range(threads)]
+    start_time = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start_time
+
+def main():
+    parser = argparse.ArgumentParser(description='Stats lock contention benchmark')
+    parser.add_argument('--threads', type=int, default=8, help='Number of hashing threads')
+    parser.add_argument('--hashes-per-thread', type=int, default=250000, help='Hashes computed by each thread')
+    args = parser.parse_args()
+
+    total = args.threads * args.hashes_per_thread
+    print(f"{args.threads} threads x {args.hashes_per_thread:,} hashes")
+
+    stats = {'total_hashes': 0}
+    stats_lock = threading.Lock()
+    locked_time = run_threads(locked_worker, args.threads, lambda i: (i, args.hashes_per_thread, stats, stats_lock))
+    print(f"{'lock per hash':<22} {locked_time:8.3f}s  {total / locked_time:>12,.0f} H/s  (counted: {stats['total_hashes']:,})")
+
+    hash_counter = HashCounter()
+    hash_counter.attach([0] * args.threads)
+    striped_time = run_threads(striped_worker, args.threads, lambda i: (i, args.hashes_per_thread, hash_counter))
+    print(f"{'striped counters':<22} {striped_time:8.3f}s  {total / striped_time:>12,.0f} H/s  (counted: {hash_counter.total():,})")
+
+    print(f"Speedup: {locked_time / striped_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for the mining hot path, with stored baselines.
+Usage:
+  python benchmarks/bench_suite.py run [--output benchmarks/baseline.json] [--cases calculate_hash,mine_block]
+  python benchmarks/bench_suite.py compare [--baseline benchmarks/baseline.json] [--current results.json] [--threshold 0.10]
+`compare` runs the suite unless --current is given, and exits with status 1 if any case is
+slower than the baseline by more than the threshold. Baselines are host-specific.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_stats_contention import run_threads, striped_worker, locked_worker
+from miner.calibration import cpu_model
+from miner.config import MinerConfig
+from miner.hash_counter import HashCounter
+from miner.logger import Logger
+from miner.miner_core import MinerCore
+from miner.session_manager import SessionManager
+from miner.thread_backend import JobGeneration
+
+BLOCK_DATA = "phonesium_1700000000_4821937_123_654321"
+BATCH_SIZE = 50000
+SOLVE_DIFFICULTY = 4 # mine_block end-to-end: ~65k hashes, the same nonce on every run
+CONTENTION_THREADS = 4
+CONTENTION_HASHES = 20000
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+LEGACY_MINER_PATH = os.path.join(os.path.dirname(BENCH_DIR), 'miner.py')
+
+def make_core(work_dir: str) -> MinerCore:
+    """
+    A MinerCore on one pooled thread with fixed settings, independent of .env tuning. Its PID
+    file and session cache live in `work_dir`, so a running miner is neither blocked nor touched.
+    """
+    MinerCore.PID_FILE = os.path.join(work_dir, 'phonesium_miner.pid')
+    config = MinerConfig()
+    config.backend = 'thread'
+    config.threads = 1
+    config.hash_kernel = 'hashlib'
+    config.hash_batch_size = BATCH_SIZE
+    config.cpu_limit = 100
+    config.cpu_affinity = 'none'
+    config.priority = 'normal'
+    config.auto_difficulty = False
+    config.difficulty, config.difficulty_mode = SOLVE_DIFFICULTY, 'hex'
+    config.cache_file = os.path.join(work_dir, 'session_cache.pkl')
+    stats = {'start_time': time.time(), 'hash_rate': 0, 'best_hash_rate': 0, 'stop_latency_ms': 0,
+             'max_stop_latency_ms': 0, 'duplicate_hashes': 0, 'extranonce_rolls': 0, 'worker_idle_seconds': 0.0}
+    core = MinerCore(config, Logger(), threading.Lock(), stats)
+    core.mining_active = True
+    return core
+
+def make_legacy_miner():
+    """
+    The single-file PhonesiumMiner (miner.py) with the same fixed settings. The miner/ package
+    shadows its module name, so it is loaded from its path; its Ctrl+C handlers are not kept.
+    """
+    spec = importlib.util.spec_from_file_location('legacy_miner', LEGACY_MINER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+    miner = module.PhonesiumMiner()
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+    miner.hash_batch_size = BATCH_SIZE
+    miner.cpu_limit = 100
+    miner.priority = 'normal'
+    miner.difficulty, miner.difficulty_mode = SOLVE_DIFFICULTY, 'hex'
+    miner.mining = True
+    return miner
+
+# Each case takes the shared MinerCore and returns (op, units per op call, unit name)
+
+def case_calculate_hash(core):
+    nonces = iter(range(10 ** 12))
+    return (lambda: core.calculate_hash(BLOCK_DATA, next(nonces))), 1, 'hash'
+
+def case_is_valid_hash(core):
+    hash_value = core.calculate_hash(BLOCK_DATA, 0)
+    return (lambda: core.is_valid_hash(hash_value, SOLVE_DIFFICULTY)), 1, 'check'
+
+def case_mine_block_thread(core):
+    generation = JobGeneration()
+    generation.value = 1
+    unreachable = core.config.hasher.digest_size * 2
+    return (lambda: core.mine_block_thread(BLOCK_DATA, 0, BATCH_SIZE, 0, generation, 1, difficulty=unreachable)), BATCH_SIZE, 'hash'
+
+def case_mine_block(core):
+    return (lambda: core.mine_block(BLOCK_DATA)), 1, 'block'
+
+def case_legacy_calculate_hash(core):
+    miner = make_legacy_miner()
+    nonces = iter(range(10 ** 12))
+    return (lambda: miner.calculate_hash(BLOCK_DATA, next(nonces))), 1, 'hash'
+
+def case_legacy_mine_block_thread(core):
+    miner = make_legacy_miner()
+    miner.difficulty = core.config.hasher.digest_size * 2 # Unreachable, so every call hashes one full batch
+    return (lambda: miner.mine_block_thread(BLOCK_DATA, 0, BATCH_SIZE, 0)), BATCH_SIZE, 'hash'
+
+def case_stats_lock_contention(core):
+    def op():
+        stats = {'total_hashes': 0}
+        stats_lock = threading.Lock()
+        run_threads(locked_worker, CONTENTION_THREADS, lambda i: (i, CONTENTION_HASHES, stats, stats_lock))
+    return op, CONTENTION_THREADS * CONTENTION_HASHES, 'hash'
+
+def case_striped_counters(core):
+    def op():
+        hash_counter = HashCounter()
+        hash_counter.attach([0] * CONTENTION_THREADS)
+        run_threads(striped_worker, CONTENTION_THREADS, lambda i: (i, CONTENTION_HASHES, hash_counter))
+    return op, CONTENTION_THREADS * CONTENTION_HASHES, 'hash'
+
+def case_save_session_cache(core):
+    session_manager = SessionManager(core.config, core.logger)
+    return (lambda: session_manager.save_session_cache(123, 'bench', core.stats)), 1, 'save'
+
+CASES = {
+    'calculate_hash': case_calculate_hash,
+    'is_valid_hash': case_is_valid_hash,
+    'mine_block_thread': case_mine_block_thread,
+    'mine_block': case_mine_block,
+    'legacy_calculate_hash': case_legacy_calculate_hash,
+    'legacy_mine_block_thread': case_legacy_mine_block_thread,
+    'stats_lock_contention': case_stats_lock_contention,
+    'striped_counters': case_striped_counters,
+    'save_session_cache': case_save_session_cache
+}
+
+def time_case(op, units: int, repeat: int, min_time: float) -> float:
+    """Best-of-`repeat` throughput in units/s; each repeat calls `op` for at least `min_time` seconds."""
+    op() # Warm-up (worker pool start, file creation)
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start_time = time.perf_counter()
+        while True:
+            op()
+            calls += 1
+            elapsed = time.perf_counter() - start_time
+            if elapsed >= min_time:
+                break
+        best = max(best, calls * units / elapsed)
+    return best
+
+def run_suite(names, repeat: int, min_time: float) -> dict:
+    """Runs the named cases and returns the results document."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='phonesium_bench_') as work_dir, open(os.devnull, 'w') as devnull:
+        quiet = lambda: contextlib.redirect_stdout(devnull) # The miner logs on every block and cache save
+        with quiet():
+            core = make_core(work_dir)
+        try:
+            for name in names:
+                print(f"{name:<24}", end=' ', flush=True)
+                with quiet():
+                    op, units, unit = CASES[name](core)
+                    rate = time_case(op, units, repeat, min_time)
+                results[name] = {'rate': rate, 'unit': f"{unit}/s"}
+                print(f"{rate:>14,.1f} {unit}/s")
+        finally:
+            with quiet():
+                core.shutdown()
+                core.release_single_instance_lock()
+    return {
+        'host': {'cpu_model': cpu_model(), 'cpu_count': os.cpu_count(),
+                 'python': f"{platform.python_implementation()} {platform.python_version()}"},
+        'timestamp': time.time(),
+        'results': results
+    }
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Prints current vs. baseline per case; returns True if any case regressed beyond `threshold`."""
+    if baseline.get('host') != current.get('host'):
+        print(f"Warning: baseline was recorded on a different host/interpreter: {baseline.get('host')}")
+    regressed = False
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            print(f"{name:<24} {result['rate']:>14,.1f} {result['unit']:<9} (no baseline)")
+            continue
+        change = result['rate'] / base['rate'] - 1 if base['rate'] else 0.0
+        flag = ''
+        if change < -threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{name:<24} {result['rate']:>14,.1f} {result['unit']:<9} baseline {base['rate']:>14,.1f}  {change:+7.1%}{flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot path micro-benchmark suite')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='Run the suite and write the results as a baseline')
+    run_parser.add_argument('--output', default=DEFAULT_BASELINE, help='Results file to write')
+    compare_parser = subparsers.add_parser('compare', help='Compare against a baseline and flag regressions')
+    compare_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file written by "run"')
+    compare_parser.add_argument('--current', help='Results file to compare (default: run the suite now)')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='Allowed slowdown as a fraction (0.10 = 10%%)')
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('--cases', default=','.join(CASES), help='Comma-separated cases to run')
+        sub.add_argument('--repeat', type=int, default=5, help='Repeats per case (best is kept)')
+        sub.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per repeat')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.cases.split(',') if name.strip()]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)} (available: {', '.join(CASES)})")
+
+    if args.command == 'run':
+        current = run_suite(names, args.repeat, args.min_time)
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.output}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(names, args.repeat, args.min_time)
+    print(f"\nThreshold: {args.threshold:.0%} slower than baseline")
+    if compare(baseline, current, args.threshold):
+        sys.exit(1)
+    print("No regressions")
+
+if __name__ == "__main__":
+    main()
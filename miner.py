@@ -18,6 +18,8 @@ import pickle
 import signal
 import psutil
 from typing import Optional, Dict, Any
+from miner.priority import apply_worker_priority, priority_ignored, validate_priority
+from miner.target import HashTarget, format_difficulty, parse_difficulty
 
 # Load environment variables
 load_dotenv()
@@ -31,7 +33,8 @@ class PhonesiumMiner:
         self.api_url = f"{self.base_url}/api.php"
         
         # Mining settings
-        self.difficulty = int(os.getenv('DIFFICULTY', 5))
+        # Same formats as app.py: a bare number in DIFFICULTY_MODE, "22b" for bits or "0x..." for a target
+        self.difficulty_mode, self.difficulty = parse_difficulty(os.getenv('DIFFICULTY', '5'), os.getenv('DIFFICULTY_MODE', 'hex'))
         self.api_secret = os.getenv('API_SECRET', 'TTXRESS2')
         self.timeout = int(os.getenv('TIMEOUT', 30))
         self.retry_attempts = int(os.getenv('RETRY_ATTEMPTS', 5))
@@ -46,6 +49,8 @@ class PhonesiumMiner:
         self.auto_difficulty = os.getenv('AUTO_DIFFICULTY', 'false').lower() == 'true'
         self.cpu_limit = int(os.getenv('CPU_LIMIT', 80))  # CPU usage limit percentage
         self.memory_limit = int(os.getenv('MEMORY_LIMIT', 1024))  # Memory limit in MB
+        self.priority = validate_priority(os.getenv('PRIORITY', 'normal'))  # Hashing threads only
+        self.low_priority_nice = max(1, min(int(os.getenv('LOW_PRIORITY_NICE', 10)), 19))
         
         # Session cache file
         self.cache_file = 'phonesium_session.cache'
@@ -378,32 +383,45 @@ class PhonesiumMiner:
         except:
             return False
     
-    def calculate_hash(self, data: str, nonce: int) -> str:
-        """Optimized hash calculation with multiple algorithms support"""
-        message = f"{data}{nonce}".encode('utf-8')
-        
-        # Use SHA256 by default, but could be extended for other algorithms
+    def create_prefix_state(self, data: str):
+        """Absorb the constant block data once so each nonce only hashes its own digits"""
         hash_algorithm = os.getenv('HASH_ALGORITHM', 'sha256').lower()
         
         if hash_algorithm == 'sha256':
-            return hashlib.sha256(message).hexdigest()
+            return hashlib.sha256(data.encode('utf-8'))
         elif hash_algorithm == 'sha1':
-            return hashlib.sha1(message).hexdigest()
+            return hashlib.sha1(data.encode('utf-8'))
         elif hash_algorithm == 'md5':
-            return hashlib.md5(message).hexdigest()
+            return hashlib.md5(data.encode('utf-8'))
         else:
-            return hashlib.sha256(message).hexdigest()  # Default fallback
+            return hashlib.sha256(data.encode('utf-8'))  # Default fallback
+    
+    def calculate_hash(self, data: str, nonce: int) -> str:
+        """Optimized hash calculation with multiple algorithms support"""
+        hasher = self.create_prefix_state(data)
+        hasher.update(b'%d' % nonce)  # Same bytes as f"{nonce}".encode('utf-8')
+        return hasher.hexdigest()
     
     def is_valid_hash(self, hash_value: str) -> bool:
         """Check if hash meets difficulty requirement with enhanced validation"""
+        if self.difficulty_mode != 'hex':
+            try:
+                digest = bytes.fromhex(hash_value)
+            except (TypeError, ValueError):
+                return False
+            return bool(digest) and HashTarget(self.difficulty, len(digest), self.difficulty_mode).is_met(digest)
         if not hash_value or len(hash_value) < self.difficulty:
             return False
         
         return hash_value.startswith('0' * self.difficulty)
     
+    def get_target_ceiling(self, digest_size: int) -> bytes:
+        """Largest raw digest that still meets the difficulty (leading zero hex digits or bits, or the target)"""
+        return HashTarget(self.difficulty, digest_size, self.difficulty_mode).ceiling
+    
     def adjust_difficulty(self):
         """Auto-adjust difficulty based on performance"""
-        if not self.auto_difficulty:
+        if not self.auto_difficulty or self.difficulty_mode != 'hex':  # Thresholds are in leading hex zeros
             return
         
         with self.stats_lock:
@@ -425,6 +443,14 @@ class PhonesiumMiner:
         hashes_computed = 0
         thread_start_time = time.time()
         
+        # Only this hashing thread is deprioritized, network and stats threads stay at normal priority
+        # (not while it shares the GIL with them, see apply_worker_priority)
+        apply_worker_priority(self.priority, self.low_priority_nice)
+        
+        # Prefix midstate is computed once per job, each nonce only copies it
+        prefix_state = self.create_prefix_state(block_data)
+        target_ceiling = self.get_target_ceiling(prefix_state.digest_size)
+        
         try:
             while self.mining and nonce < end_nonce and not self.shutdown_requested and not self.paused:
                 batch_end = min(nonce + self.hash_batch_size, end_nonce)
@@ -434,15 +460,17 @@ class PhonesiumMiner:
                     if not self.mining or self.shutdown_requested or self.paused:
                         return None
                     
-                    block_hash = self.calculate_hash(block_data, batch_nonce)
+                    hasher = prefix_state.copy()
+                    hasher.update(b'%d' % batch_nonce)
                     hashes_computed += 1
                     
                     # Update global hash counter
                     with self.stats_lock:
                         self.stats['total_hashes'] += 1
                     
-                    # Check if valid hash found
-                    if self.is_valid_hash(block_hash):
+                    # Check if valid hash found (raw digest compare, hex only for the winner)
+                    if hasher.digest() <= target_ceiling:
+                        block_hash = hasher.hexdigest()
                         thread_time = time.time() - thread_start_time
                         thread_hash_rate = hashes_computed / thread_time if thread_time > 0 else 0
                         
@@ -469,7 +497,7 @@ class PhonesiumMiner:
     
     def mine_block(self, block_data: str) -> Optional[Dict[str, Any]]:
         """Enhanced multi-threaded mining with adaptive performance"""
-        self.log('INFO', f"Mining with {self.threads} threads (Difficulty: {self.difficulty})")
+        self.log('INFO', f"Mining with {self.threads} threads (Difficulty: {format_difficulty(self.difficulty, self.difficulty_mode)})")
         
         start_time = time.time()
         solution_found = False
@@ -560,6 +588,13 @@ class PhonesiumMiner:
                 'memory_usage': self.stats.get('memory_usage', 0)
             }
         }
+        if self.difficulty_mode != 'hex':
+            # 'difficulty' stays in leading hex zeros (rounded down) for servers that only know that unit
+            target = HashTarget(self.difficulty, self.create_prefix_state('').digest_size, self.difficulty_mode)
+            payload['difficulty'] = int(target.zero_bits) // 4
+            payload['difficulty_mode'] = self.difficulty_mode
+            payload['difficulty_bits'] = round(target.zero_bits, 4)
+            payload['target'] = target.ceiling.hex()
         
         for attempt in range(self.retry_attempts):
             try:
@@ -717,7 +752,7 @@ class PhonesiumMiner:
             print(f"👤 Miner: {self.username} (ID: {self.user_id})")
             print(f"⏱️  Runtime: {elapsed:.0f}s ({elapsed/3600:.1f}h)")
             print(f"🧵 Threads: {self.threads} | CPU: {self.stats['cpu_usage']:.1f}% | RAM: {self.stats['memory_usage']:.1f}%")
-            print(f"💎 Difficulty: {self.difficulty} leading zeros")
+            print(f"💎 Difficulty: {format_difficulty(self.difficulty, self.difficulty_mode)}")
             print(f"{'='*70}")
             print(f"📈 MINING PERFORMANCE")
             print(f"💎 Blocks Accepted: {self.stats['accepted_blocks']}")
@@ -766,7 +801,7 @@ class PhonesiumMiner:
         print(f"{'='*70}")
         print(f"👤 User: {self.username} (ID: {self.user_id})")
         print(f"🧵 Threads: {self.threads} / {multiprocessing.cpu_count()} available")
-        print(f"💎 Difficulty: {self.difficulty} leading zeros")
+        print(f"💎 Difficulty: {format_difficulty(self.difficulty, self.difficulty_mode)}")
         print(f"🌐 Server: {self.base_url}")
         print(f"⚡ Target Rate: ~{self.nonce_range * self.threads:,} H/s")
         print(f"🔧 Auto Difficulty: {'ON' if self.auto_difficulty else 'OFF'}")
@@ -790,6 +825,10 @@ class PhonesiumMiner:
         """Start the enhanced mining process"""
         self.display_banner()
         
+        if priority_ignored(self.priority, process_workers=False):
+            self.log('WARNING', f"Priority '{self.priority}' is ignored: the hashing threads share the GIL with the network threads "
+                                f"(use app.py with MINING_BACKEND=process)")
+        
         self.mining = True
         
         # Start background monitors
@@ -870,6 +909,8 @@ Examples:
   python miner.py                          # Interactive login
   python miner.py --threads 8              # Use 8 threads
   python miner.py --difficulty 6           # Set difficulty to 6
+  python miner.py --difficulty 22b         # 22 leading zero bits
+  python miner.py --priority idle          # Hash only when the CPU is otherwise idle
   python miner.py --user-id 123 --username miner1  # Skip login
   python miner.py --clear-cache            # Clear session cache
   python miner.py --url https://myserver.com  # Custom server
@@ -879,18 +920,23 @@ Examples:
     parser.add_argument('--user-id', type=int, help='User ID (skip login)')
     parser.add_argument('--username', help='Username (with --user-id)')
     parser.add_argument('--threads', type=int, help='Number of mining threads')
-    parser.add_argument('--difficulty', type=int, help='Mining difficulty (leading zeros)')
+    parser.add_argument('--difficulty', help='Mining difficulty: leading zeros (6), zero bits (22b) or a target (0x00000fff...)')
     parser.add_argument('--clear-cache', action='store_true', help='Clear session cache')
     parser.add_argument('--url', help='Custom base URL (e.g., https://shp.re)')
     parser.add_argument('--auto-difficulty', action='store_true', help='Enable auto difficulty adjustment')
     parser.add_argument('--cpu-limit', type=int, help='CPU usage limit percentage (1-100)')
+    parser.add_argument('--priority', choices=['idle', 'low', 'normal'], help='Scheduling priority of the hashing threads (idle = SCHED_IDLE; only on free-threaded Python)')
     parser.add_argument('--log-file', action='store_true', help='Enable logging to file')
     parser.add_argument('--version', action='version', version='Phonesium Miner v2.0')
     
     args = parser.parse_args()
     
     # Initialize miner
-    miner = PhonesiumMiner()
+    try:
+        miner = PhonesiumMiner()
+    except ValueError as e:
+        print(f"Configuration error: {e}")
+        sys.exit(1)
     
     # Apply command line arguments
     if args.url:
@@ -908,8 +954,16 @@ Examples:
         print(f"Using {miner.threads} threads")
     
     if args.difficulty:
-        miner.difficulty = max(1, min(args.difficulty, 10))  # Limit between 1-10
-        print(f"Using difficulty: {miner.difficulty}")
+        try:
+            miner.difficulty_mode, miner.difficulty = parse_difficulty(args.difficulty, miner.difficulty_mode)
+        except ValueError as e:
+            print(f"Configuration error: {e}")
+            sys.exit(1)
+        if miner.difficulty_mode == 'hex':
+            miner.difficulty = max(1, min(miner.difficulty, 10))  # Limit between 1-10
+        elif miner.difficulty_mode == 'bits':
+            miner.difficulty = max(1, min(miner.difficulty, 40))
+        print(f"Using difficulty: {format_difficulty(miner.difficulty, miner.difficulty_mode)}")
     
     if args.auto_difficulty:
         miner.auto_difficulty = True
@@ -919,6 +973,10 @@ Examples:
         miner.cpu_limit = max(10, min(args.cpu_limit, 100))  # Limit between 10-100
         print(f"CPU limit set to: {miner.cpu_limit}%")
     
+    if args.priority:
+        miner.priority = args.priority
+        print(f"Hashing priority: {miner.priority}")
+    
     if args.log_file:
         os.environ['LOG_TO_FILE'] = 'true'
         print("File logging enabled")
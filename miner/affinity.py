@@ -0,0 +1,94 @@
+import os
+from typing import List, Optional, Sequence
+
+# Placement policies for CPU_AFFINITY; anything else is read as an explicit CPU list like "2,3,6-7"
+AFFINITY_POLICIES = ('none', 'physical', 'skip-core-0')
+
+def available_cpus() -> List[int]:
+    """Logical CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Parses a Linux-style CPU list ("0,2,4-7"). Raises ValueError on malformed input."""
+    cpus = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+def _core_siblings(cpu: int) -> List[int]:
+    """Logical CPUs sharing a physical core with `cpu` (just `cpu` if the topology is unknown)."""
+    try:
+        with open(f'/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list') as f:
+            return parse_cpu_list(f.read())
+    except (OSError, ValueError):
+        return [cpu]
+
+def physical_first(cpus: Sequence[int]) -> List[int]:
+    """Orders CPUs so every physical core gets one worker before any core gets a second one."""
+    primary, secondary = [], []
+    seen_cores = set()
+    for cpu in cpus:
+        core = tuple(_core_siblings(cpu))
+        if core in seen_cores:
+            secondary.append(cpu)
+        else:
+            seen_cores.add(core)
+            primary.append(cpu)
+    return primary + secondary
+
+def plan_affinity(policy: str, workers: int) -> List[Optional[int]]:
+    """
+    Returns the CPU each worker should be pinned to (None = not pinned).
+    'physical' spreads workers over physical cores first, 'skip-core-0' does the same but keeps
+    core 0 and its hyperthread siblings free for the submission and monitoring threads, and an
+    explicit CPU list is used in order. Workers wrap around when there are more workers than CPUs.
+    """
+    policy = policy.strip().lower()
+    if policy == 'none' or not hasattr(os, 'sched_setaffinity'):
+        return [None] * workers
+
+    allowed = available_cpus()
+    if policy == 'physical':
+        cpus = physical_first(allowed)
+    elif policy == 'skip-core-0':
+        reserved = set(_core_siblings(0))
+        cpus = physical_first([cpu for cpu in allowed if cpu not in reserved]) or allowed
+    else:
+        cpus = [cpu for cpu in parse_cpu_list(policy) if cpu in allowed]
+        if not cpus:
+            raise ValueError(f"CPU list '{policy}' contains no usable CPUs (available: {allowed})")
+    return [cpus[i % len(cpus)] for i in range(workers)]
+
+def validate_affinity(policy: str) -> str:
+    """
+    Normalizes a CPU_AFFINITY value. Raises ValueError for unknown policies, malformed lists and
+    lists without a CPU this process may run on, so a bad value fails at startup, not in the pool.
+    """
+    policy = policy.strip().lower()
+    if policy not in AFFINITY_POLICIES:
+        try:
+            if not parse_cpu_list(policy):
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Invalid CPU affinity '{policy}' (use {', '.join(AFFINITY_POLICIES)} or a CPU list like 0,2-3)")
+        plan_affinity(policy, 1)
+    return policy
+
+def pin_to_cpu(cpu: Optional[int]) -> bool:
+    """Pins the calling thread (or single-threaded process) to one CPU. Returns False if not pinned."""
+    if cpu is None or not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu}) # pid 0 is the calling thread on Linux
+        return True
+    except OSError:
+        return False
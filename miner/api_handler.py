@@ -115,7 +115,8 @@ class ApiHandler:
         except Exception:
             return {'success': False}
 
-    def submit_block(self, user_id: int, block_hash: str, nonce: int, difficulty: int, hash_rate: int, system_info: Dict[str, Any]) -> Dict[str, Any]:
+    def submit_block(self, user_id: int, block_hash: str, nonce: int, difficulty: int, hash_rate: int, system_info: Dict[str, Any],
+                     difficulty_mode: str = 'hex') -> Dict[str, Any]:
         """Submits a mined block to the API with retry logic."""
         payload = {
             'user_id': user_id,
@@ -127,6 +128,13 @@ class ApiHandler:
             'client_version': '2.0',
             'system_info': system_info
         }
+        if difficulty_mode != 'hex':
+            # 'difficulty' stays in leading hex zeros (rounded down) for servers that only know that unit
+            target = self.config.hasher.target(difficulty, difficulty_mode)
+            payload['difficulty'] = int(target.zero_bits) // 4
+            payload['difficulty_mode'] = difficulty_mode
+            payload['difficulty_bits'] = round(target.zero_bits, 4)
+            payload['target'] = target.ceiling.hex()
         
         for attempt in range(self.config.retry_attempts):
             try:
@@ -0,0 +1,154 @@
+import os
+import platform
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from .config import MinerConfig
+from .logger import Logger
+from .runtime import gil_enabled
+
+BENCHMARK_SEED = 20240101 # Seeds generate_block_data so every run hashes the same template
+BENCHMARK_TIMESTAMP = 1700000000
+BENCHMARK_DIFFICULTY = 8 # Pinned so results stay comparable; rarely met, and workers keep going when it is
+BACKENDS = ('thread', 'process')
+
+def worker_sweep(max_workers: int) -> List[int]:
+    """1, 2, 4, ... up to and including `max_workers`."""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max(1, max_workers))
+    return counts
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+class BatchTimer:
+    """
+    Samples the per-worker hash slots in a background thread while a measurement runs. Workers
+    add to their slot once per batch, so the time between two changes of a slot is one batch.
+    Resolution is the poll interval; the first change of each slot only starts its clock.
+    """
+    POLL_INTERVAL = 0.002
+
+    def __init__(self, hash_counter):
+        self.hash_counter = hash_counter
+        self.batch_times = []
+        self._running = False
+        self._thread = None
+
+    def _run(self):
+        last_counts = self.hash_counter.per_worker()
+        last_change = [None] * len(last_counts)
+        while self._running:
+            time.sleep(self.POLL_INTERVAL)
+            now = time.perf_counter()
+            for worker_id, count in enumerate(self.hash_counter.per_worker()):
+                if count != last_counts[worker_id]:
+                    if last_change[worker_id] is not None:
+                        self.batch_times.append(now - last_change[worker_id])
+                    last_counts[worker_id] = count
+                    last_change[worker_id] = now
+
+    def __enter__(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._running = False
+        self._thread.join()
+
+class MiningBenchmark:
+    """
+    Offline throughput benchmark (python app.py --benchmark). Hashes a fixed, seeded template at a
+    pinned difficulty on each backend and worker count, without contacting the server, and
+    reports H/s, H/s per core in use (workers beyond the CPU count share cores), scaling
+    efficiency against a single-worker run of the same backend (always measured, even when the
+    sweep skips 1), p50/p99 batch time and cancellation latency. CPU_LIMIT is lifted for the run.
+    """
+    def __init__(self, config: MinerConfig, logger: Logger, miner_core):
+        self.config = config
+        self.logger = logger
+        self.miner_core = miner_core
+
+    def template(self) -> str:
+        """The benchmark block template, identical on every run."""
+        state = random.getstate()
+        random.seed(BENCHMARK_SEED)
+        try:
+            return self.miner_core.generate_block_data(0, timestamp=BENCHMARK_TIMESTAMP, session_start=BENCHMARK_TIMESTAMP)
+        finally:
+            random.setstate(state)
+
+    def _measure(self, backend: str, workers: int, block_data: str, difficulty: int, difficulty_mode: str,
+                 seconds: float) -> Dict[str, Any]:
+        self.config.backend = backend
+        self.config.threads = workers
+        # Warm-up: pool start, kernel probe
+        self.miner_core.measure_throughput(min(0.5, seconds), block_data, difficulty, difficulty_mode)
+        with BatchTimer(self.miner_core.hash_counter) as timer:
+            result = self.miner_core.measure_throughput(seconds, block_data, difficulty, difficulty_mode)
+        self.logger.log('INFO', f"Benchmark: {workers} {backend} workers: {result['hash_rate']:,.0f} H/s, "
+                                f"stop {result['stop_latency_ms']:.1f}ms")
+        return {
+            'backend': backend,
+            'workers': workers,
+            'hash_rate': round(result['hash_rate'], 1),
+            'hash_rate_per_core': round(result['hash_rate'] / min(workers, os.cpu_count() or 1), 1),
+            'batch_time_p50_ms': round(percentile(timer.batch_times, 0.50) * 1000, 2),
+            'batch_time_p99_ms': round(percentile(timer.batch_times, 0.99) * 1000, 2),
+            'batches_timed': len(timer.batch_times),
+            'stop_latency_ms': round(result['stop_latency_ms'], 2)
+        }
+
+    def run(self, seconds: float, difficulty: Optional[int] = None, difficulty_mode: str = 'hex', backends=BACKENDS,
+            worker_counts: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Runs the sweep and returns the machine-readable report."""
+        if difficulty is None:
+            difficulty, difficulty_mode = BENCHMARK_DIFFICULTY, 'hex'
+        worker_counts = worker_counts or worker_sweep(self.config.threads)
+        original = (self.config.backend, self.config.threads, self.config.cpu_limit)
+        self.config.cpu_limit = 100
+        block_data = self.template()
+        results = []
+        try:
+            for backend in backends:
+                # Efficiency is always relative to one worker, wherever (or whether) 1 is in the sweep
+                baseline = self._measure(backend, 1, block_data, difficulty, difficulty_mode, seconds)
+                single_rate = baseline['hash_rate']
+                for workers in worker_counts:
+                    result = dict(baseline) if workers == 1 else self._measure(backend, workers, block_data, difficulty,
+                                                                               difficulty_mode, seconds)
+                    result['scaling_efficiency'] = round(result['hash_rate'] / (single_rate * workers), 3) if single_rate else 0.0
+                    results.append(result)
+        finally:
+            self.config.backend, self.config.threads, self.config.cpu_limit = original
+        return {
+            'host': {
+                'cpu_count': os.cpu_count(),
+                'platform': platform.platform(),
+                'python': f"{platform.python_implementation()} {platform.python_version()}",
+                'gil_enabled': gil_enabled()
+            },
+            'settings': {
+                'block_data': block_data,
+                'difficulty': difficulty,
+                'difficulty_mode': difficulty_mode,
+                'hash_algorithm': self.config.hasher.name,
+                'hash_kernel': self.config.hash_kernel,
+                'hash_batch_size': self.config.hash_batch_size,
+                'seconds_per_run': seconds,
+                'cpu_affinity': self.config.cpu_affinity,
+                'priority': self.config.priority
+            },
+            'results': results
+        }
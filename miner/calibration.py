@@ -0,0 +1,169 @@
+import json
+import multiprocessing
+import os
+import platform
+import time
+from typing import Any, Dict, List, Optional
+from .config import MinerConfig
+from .logger import Logger
+from .runtime import gil_enabled, resolve_backend
+
+def cpu_model() -> str:
+    """CPU model name, from /proc/cpuinfo where available."""
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.lower().startswith(('model name', 'hardware', 'cpu model')):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine() or 'unknown'
+
+def host_fingerprint(config: MinerConfig) -> Dict[str, Any]:
+    """Everything a calibration result depends on; a cached profile is only reused on an exact match."""
+    return {
+        'cpu_model': cpu_model(),
+        'cpu_count': os.cpu_count(),
+        'python': f"{platform.python_implementation()} {platform.python_version()}",
+        'hash_algorithm': config.hasher.name,
+        'backend': resolve_backend(config.backend),
+        'free_threaded': not gil_enabled(),
+        'max_threads': config.threads
+    }
+
+class CalibrationProfiles:
+    """
+    Calibration results persisted in a small JSON file, keyed by host fingerprint, so restarts
+    skip calibration until the hardware, interpreter or settings change or the profile ages out.
+    """
+    def __init__(self, path: str, max_age_days: float):
+        self.path = path
+        self.max_age = max_age_days * 86400
+
+    @staticmethod
+    def _key(fingerprint: Dict[str, Any]) -> str:
+        return json.dumps(fingerprint, sort_keys=True)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                profiles = json.load(f)
+            return profiles if isinstance(profiles, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for this fingerprint, or None if missing or stale."""
+        profile = self._read().get(self._key(fingerprint))
+        if not profile or time.time() - profile.get('timestamp', 0) > self.max_age:
+            return None
+        return profile.get('result')
+
+    def save(self, fingerprint: Dict[str, Any], result: Dict[str, Any]):
+        """Stores a result for this fingerprint, keeping other hosts' profiles in the file."""
+        profiles = self._read()
+        profiles[self._key(fingerprint)] = {'fingerprint': fingerprint, 'timestamp': time.time(), 'result': result}
+        with open(self.path, 'w') as f:
+            json.dump(profiles, f, indent=2)
+
+class Calibrator:
+    """
+    Short startup measurement that tunes THREADS, HASH_BATCH_SIZE and NONCE_RANGE for this host.
+    Worker counts are measured first at the configured batch size, then batch sizes at the best
+    worker count. A worker count only qualifies if its cancellation latency stays within
+    max_stop_latency_ms. Batch sizes are not held to it: workers check for preemption once per
+    nonce block whatever the batch size, so their stop latencies differ only by noise. Among the
+    candidates, a smaller one within TOLERANCE of the best rate wins (fewer workers leave CPU to
+    the host, smaller batches react faster).
+    """
+    BATCH_SIZES = (10000, 25000, 50000, 100000)
+    TOLERANCE = 0.03
+    ROLL_SECONDS = 10 # NONCE_RANGE is sized so each worker takes about this long per extranonce
+
+    def __init__(self, config: MinerConfig, logger: Logger, miner_core):
+        self.config = config
+        self.logger = logger
+        self.miner_core = miner_core
+
+    def worker_candidates(self) -> List[int]:
+        """1, half and all of the configured worker count (THREADS stays the upper bound)."""
+        threads = max(1, min(self.config.threads, multiprocessing.cpu_count()))
+        return sorted({1, max(1, threads // 2), threads})
+
+    def _measure(self, threads: int, batch_size: int, seconds: float) -> Dict[str, float]:
+        self.config.threads = threads
+        self.config.hash_batch_size = batch_size
+        result = self.miner_core.measure_throughput(seconds)
+        self.logger.log('DEBUG', f"Calibration: {threads} workers, batch {batch_size:,}: "
+                                 f"{result['hash_rate']:.0f} H/s, stop {result['stop_latency_ms']:.1f}ms")
+        return result
+
+    def _pick(self, results: Dict[int, Dict[str, float]], bound_latency: bool = True) -> int:
+        """Smallest candidate within TOLERANCE of the best qualifying rate."""
+        qualifying = {key: r for key, r in results.items()
+                      if not bound_latency or r['stop_latency_ms'] <= self.config.calibration_max_stop_ms}
+        if not qualifying: # Nothing met the latency bound, take the most responsive one
+            return min(results, key=lambda key: results[key]['stop_latency_ms'])
+        best_rate = max(r['hash_rate'] for r in qualifying.values())
+        return min(key for key, r in qualifying.items() if r['hash_rate'] >= best_rate * (1 - self.TOLERANCE))
+
+    def run(self) -> Dict[str, Any]:
+        """Measures the candidates within CALIBRATION_SECONDS and returns the chosen settings."""
+        workers = self.worker_candidates()
+        batch_sizes = self.BATCH_SIZES
+        seconds = self.config.calibration_seconds / (len(workers) + len(batch_sizes))
+
+        by_workers = {threads: self._measure(threads, self.config.hash_batch_size, seconds) for threads in workers}
+        threads = self._pick(by_workers)
+        by_batch = {batch_size: self._measure(threads, batch_size, seconds) for batch_size in batch_sizes}
+        batch_size = self._pick(by_batch, bound_latency=False)
+
+        hash_rate = by_batch[batch_size]['hash_rate']
+        per_worker = hash_rate / threads
+        nonce_range = max(batch_size, int(per_worker * self.ROLL_SECONDS) // batch_size * batch_size)
+        return {
+            'threads': threads,
+            'hash_batch_size': batch_size,
+            'nonce_range': nonce_range,
+            'hash_rate': hash_rate,
+            'stop_latency_ms': by_batch[batch_size]['stop_latency_ms']
+        }
+
+    def apply(self, result: Dict[str, Any]):
+        """Writes calibrated settings into the config."""
+        self.config.threads = result['threads']
+        self.config.hash_batch_size = result['hash_batch_size']
+        self.config.nonce_range = result['nonce_range']
+
+    def calibrate(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Applies the cached profile for this host or, if there is none (or `force`), runs the
+        calibration, applies it and caches it. The original settings are kept if it fails.
+        """
+        profiles = CalibrationProfiles(self.config.calibration_profile_file, self.config.calibration_max_age_days)
+        fingerprint = host_fingerprint(self.config)
+        if not force:
+            cached = profiles.load(fingerprint)
+            if cached:
+                self.apply(cached)
+                self.logger.log('INFO', f"Using cached calibration: {cached['threads']} workers, batch {cached['hash_batch_size']:,}, "
+                                        f"nonce range {cached['nonce_range']:,} (--recalibrate to measure again)")
+                return cached
+
+        original = (self.config.threads, self.config.hash_batch_size, self.config.nonce_range)
+        self.logger.log('INFO', f"Calibrating for ~{self.config.calibration_seconds:.0f}s (skip with --no-calibrate)...")
+        try:
+            result = self.run()
+        except Exception as e:
+            self.config.threads, self.config.hash_batch_size, self.config.nonce_range = original
+            self.logger.log('WARNING', f"Calibration failed, keeping configured settings: {e}")
+            return {}
+        self.apply(result)
+        self.logger.log('SUCCESS', f"Calibrated: {result['threads']} workers, batch {result['hash_batch_size']:,}, "
+                                   f"nonce range {result['nonce_range']:,} ({result['hash_rate']:.0f} H/s, "
+                                   f"stop {result['stop_latency_ms']:.1f}ms)")
+        try:
+            profiles.save(fingerprint, result)
+        except OSError as e:
+            self.logger.log('WARNING', f"Failed to save calibration profile: {e}")
+        return result
@@ -1,12 +1,20 @@
 import os
 import multiprocessing
+from .affinity import validate_affinity
+from .hash_engine import validate_hash_kernel
+from .hashers import resolve_hasher
+from .priority import validate_priority
+from .runtime import validate_backend
+from .target import parse_difficulty
 
 class MinerConfig:
     """Manages all configuration settings for the Phonesium Miner."""
     def __init__(self):
         self.base_url = os.getenv('BASE_URL', 'http://192.168.1.77:8000/')
         self.api_url = f"{self.base_url}/api"
-        self.difficulty = int(os.getenv('DIFFICULTY', 5))
+        # Bare DIFFICULTY numbers count leading zero hex digits ('hex') or bits ('bits'), or are a target ('target');
+        # "22b" always means bits and "0x..." an explicit target
+        self.difficulty_mode, self.difficulty = parse_difficulty(os.getenv('DIFFICULTY', '5'), os.getenv('DIFFICULTY_MODE', 'hex'))
         self.api_secret = os.getenv('API_SECRET', 'TTXRESS2')
         self.timeout = int(os.getenv('TIMEOUT', 30))
         self.retry_attempts = int(os.getenv('RETRY_ATTEMPTS', 5))
@@ -14,11 +22,37 @@ class MinerConfig:
         self.threads = min(int(os.getenv('THREADS', 4)), multiprocessing.cpu_count())
         self.nonce_range = int(os.getenv('NONCE_RANGE', 2000000))
         self.hash_batch_size = int(os.getenv('HASH_BATCH_SIZE', 50000))
+        # Startup calibration of threads, batch size and nonce range (see miner.calibration)
+        self.calibrate = os.getenv('CALIBRATE', 'true').lower() == 'true'
+        self.calibration_seconds = float(os.getenv('CALIBRATION_SECONDS', 4))
+        self.calibration_max_stop_ms = float(os.getenv('CALIBRATION_MAX_STOP_MS', 50))
+        self.calibration_profile_file = 'phonesium_calibration.json' # Cached results per host fingerprint
+        self.calibration_max_age_days = float(os.getenv('CALIBRATION_MAX_AGE_DAYS', 7))
+        self.recalibrate = False
         self.auto_difficulty = os.getenv('AUTO_DIFFICULTY', 'false').lower() == 'true'
+        # Auto-difficulty controller (see miner.difficulty): expected seconds per block and how fast it may move
+        self.target_block_time = max(1.0, float(os.getenv('TARGET_BLOCK_TIME', 60)))
+        # In the units of the difficulty mode; unset means 3-8 hex zeros or 12-32 bits
+        self.min_difficulty = int(os.getenv('MIN_DIFFICULTY')) if os.getenv('MIN_DIFFICULTY') else None
+        self.max_difficulty = int(os.getenv('MAX_DIFFICULTY')) if os.getenv('MAX_DIFFICULTY') else None
+        self.difficulty_hysteresis = max(0.0, float(os.getenv('DIFFICULTY_HYSTERESIS', 0.15)))
+        self.difficulty_max_step = max(1, int(os.getenv('DIFFICULTY_MAX_STEP', 1)))
+        self.difficulty_adjust_interval = float(os.getenv('DIFFICULTY_ADJUST_INTERVAL', 60))
         self.cpu_limit = int(os.getenv('CPU_LIMIT', 80))
         self.memory_limit = int(os.getenv('MEMORY_LIMIT', 1024))
         self.cache_file = 'phonesium_session.cache'
         self.mining_timeout = int(os.getenv('MINING_TIMEOUT', '120')) # 2 minutes default
+        self.continuous_mining = os.getenv('CONTINUOUS_MINING', 'false').lower() == 'true' # Every solution per template
+        self.submit_queue_size = max(1, int(os.getenv('SUBMIT_QUEUE_SIZE', 16))) # Pending solutions kept for the submitter
+        self.backend = validate_backend(os.getenv('MINING_BACKEND', 'auto')) # 'auto', 'thread' or 'process'
+        # Worker placement: 'none', 'physical', 'skip-core-0' or a CPU list such as "2,3,6-7"
+        self.cpu_affinity = validate_affinity(os.getenv('CPU_AFFINITY', 'none'))
+        # Scheduling priority of the hashing workers only: 'normal', 'low' (nice LOW_PRIORITY_NICE) or 'idle' (SCHED_IDLE)
+        self.priority = validate_priority(os.getenv('PRIORITY', 'normal'))
+        self.low_priority_nice = max(1, min(int(os.getenv('LOW_PRIORITY_NICE', 10)), 19))
+        # Resolved once here; raises ValueError for unknown algorithms so startup fails fast
+        self.hasher = resolve_hasher(os.getenv('HASH_ALGORITHM', 'sha256'))
+        self.hash_kernel = validate_hash_kernel(os.getenv('HASH_KERNEL', 'auto')) # 'auto', 'hashlib' or 'numpy'
 
     def update_from_args(self, args):
         """Updates configuration based on command-line arguments."""
@@ -28,10 +62,38 @@ class MinerConfig:
         if args.threads:
             self.threads = min(args.threads, multiprocessing.cpu_count())
         if args.difficulty:
-            self.difficulty = max(1, min(args.difficulty, 10))
+            self.difficulty_mode, self.difficulty = parse_difficulty(args.difficulty, self.difficulty_mode)
+            if self.difficulty_mode == 'hex':
+                self.difficulty = max(1, min(self.difficulty, 10))
+            elif self.difficulty_mode == 'bits':
+                self.difficulty = max(1, min(self.difficulty, 40))
         if args.auto_difficulty:
             self.auto_difficulty = True
+        if args.target_block_time:
+            self.target_block_time = max(1.0, args.target_block_time)
+        if args.continuous:
+            self.continuous_mining = True
+        if args.no_calibrate:
+            self.calibrate = False
+        if args.recalibrate:
+            self.calibrate = True
+            self.recalibrate = True
         if args.cpu_limit:
             self.cpu_limit = max(10, min(args.cpu_limit, 100))
+        if args.backend:
+            self.backend = args.backend
+        if args.affinity:
+            self.cpu_affinity = validate_affinity(args.affinity)
+        if args.priority:
+            self.priority = validate_priority(args.priority)
+        if args.hash_kernel:
+            self.hash_kernel = validate_hash_kernel(args.hash_kernel)
         if args.log_file:
             os.environ['LOG_TO_FILE'] = 'true'
+
+    def difficulty_bounds(self):
+        """(min, max) difficulty for auto-difficulty, in the units of the difficulty mode."""
+        default_min, default_max = (12, 32) if self.difficulty_mode == 'bits' else (3, 8)
+        min_difficulty = max(1, self.min_difficulty if self.min_difficulty is not None else default_min)
+        max_difficulty = self.max_difficulty if self.max_difficulty is not None else default_max
+        return min_difficulty, max(min_difficulty, max_difficulty)
@@ -0,0 +1,57 @@
+import math
+import time
+from typing import Optional
+from .config import MinerConfig
+
+class DifficultyController:
+    """
+    Auto-difficulty that targets an expected block time. A difficulty of d leading hex zeros
+    takes 16**d hashes on average (2**d for leading zero bits), so at H H/s the ideal
+    (fractional) difficulty is log_base(H * target_block_time). The difficulty only moves once
+    the ideal is more than 0.5 + hysteresis away from it, so a hash rate near a boundary does
+    not flip it back and forth, and then by at most max_step per adjustment and once per
+    adjust_interval seconds. Settings are read from the config on every call, so command line
+    overrides apply. Explicit targets ('target' mode) are left alone.
+    """
+    WORK_BASES = {'hex': 16, 'bits': 2} # Expected work multiplier per difficulty step
+
+    def __init__(self, config: MinerConfig):
+        self.config = config
+        self._last_adjusted = None
+
+    @property
+    def work_base(self) -> int:
+        return self.WORK_BASES[self.config.difficulty_mode]
+
+    def expected_hashes(self, difficulty: int) -> float:
+        """Average number of hashes needed to find one solution at `difficulty`."""
+        return float(self.work_base ** difficulty)
+
+    def expected_block_time(self, difficulty: int, hash_rate: float) -> float:
+        """Average seconds per solution at `difficulty` and `hash_rate` (inf without a rate)."""
+        return self.expected_hashes(difficulty) / hash_rate if hash_rate > 0 else math.inf
+
+    def ideal_difficulty(self, hash_rate: float) -> float:
+        """Fractional difficulty whose expected block time equals the target."""
+        return math.log(hash_rate * self.config.target_block_time, self.work_base)
+
+    def next_difficulty(self, difficulty: int, hash_rate: float, now: Optional[float] = None) -> int:
+        """Returns the difficulty to mine at next; unchanged while inside the hysteresis band or the interval."""
+        config = self.config
+        now = time.monotonic() if now is None else now
+        if config.difficulty_mode not in self.WORK_BASES:
+            return difficulty
+        if hash_rate <= 0 or hash_rate * config.target_block_time <= 1:
+            return difficulty
+        if self._last_adjusted is not None and now - self._last_adjusted < config.difficulty_adjust_interval:
+            return difficulty
+
+        error = self.ideal_difficulty(hash_rate) - difficulty
+        if abs(error) <= 0.5 + config.difficulty_hysteresis:
+            return difficulty
+        step = max(-config.difficulty_max_step, min(config.difficulty_max_step, round(error)))
+        min_difficulty, max_difficulty = config.difficulty_bounds()
+        new_difficulty = max(min_difficulty, min(max_difficulty, difficulty + step))
+        if new_difficulty != difficulty:
+            self._last_adjusted = now
+        return new_difficulty
@@ -0,0 +1,43 @@
+import threading
+from typing import List, Sequence
+
+class HashCounter:
+    """
+    Striped hash counter. Each worker adds to its own slot without locking, and readers
+    aggregate the slots on demand. Slot storage comes from the worker pool: a plain list
+    for threads or a shared array for worker processes. Only swapping the storage takes a
+    (local) lock, so the hot path stays lock-free with or without the GIL.
+    """
+    def __init__(self):
+        self._slots = []
+        self._retired = 0 # Hashes counted by slot storage that has since been replaced
+        self._lock = threading.Lock()
+
+    @property
+    def slots(self) -> Sequence[int]:
+        return self._slots
+
+    def attach(self, slots: Sequence[int]):
+        """Switches to new slot storage (e.g. a new worker pool), keeping the running total."""
+        with self._lock:
+            self._retired += sum(self._slots)
+            self._slots = slots
+
+    def ensure_slots(self, count: int):
+        """Makes sure at least `count` slots exist, falling back to thread-local list storage."""
+        with self._lock: # Standalone worker threads may call this concurrently
+            if len(self._slots) < count:
+                self._retired += sum(self._slots)
+                self._slots = [0] * count
+
+    def add(self, slot: int, hashes: int):
+        """Adds hashes to one worker's slot (only that worker may call this)."""
+        self._slots[slot] += hashes
+
+    def per_worker(self) -> List[int]:
+        """Returns the hash count of each worker slot in the current pool."""
+        return list(self._slots)
+
+    def total(self) -> int:
+        """Returns the aggregated hash count."""
+        return self._retired + sum(self._slots)
@@ -0,0 +1,134 @@
+from typing import Any, Iterator, Optional, Tuple
+from .hashers import HasherSpec, resolve_hasher
+from .target import HashTarget
+
+# Two-level midstate tree: one cached state per block of NONCE_BLOCK_SIZE nonces,
+# the inner loop only feeds the low-order NONCE_BLOCK_DIGITS digits.
+NONCE_BLOCK_DIGITS = 3
+NONCE_BLOCK_SIZE = 10 ** NONCE_BLOCK_DIGITS
+_LOW_SUFFIXES = tuple(b'%0*d' % (NONCE_BLOCK_DIGITS, i) for i in range(NONCE_BLOCK_SIZE))
+_SHORT_SUFFIXES = tuple(b'%d' % i for i in range(NONCE_BLOCK_SIZE)) # Nonces below one block have no high digits
+
+# Batch hashing kernels for HASH_KERNEL; 'auto' probes which one is faster on this host
+HASH_KERNELS = ('auto', 'hashlib', 'numpy')
+
+class NonceEncoder:
+    """
+    ASCII decimal digits of a counter, kept in a preallocated bytearray and incremented in place
+    with carry propagation, so consecutive values need no int -> str -> bytes conversion.
+    The digits are byte-identical to b'%d' % value.
+    """
+    MAX_DIGITS = 20
+
+    def __init__(self, value: int):
+        digits = b'%d' % value
+        self._start = self.MAX_DIGITS - len(digits) # Index of the most significant digit
+        self._buffer = bytearray(b'0' * self._start + digits) # Left-padded with '0' so carries can grow the number
+        self._view = memoryview(self._buffer)
+        self.value = value
+
+    @property
+    def digits(self) -> memoryview:
+        """Zero-copy view of the current digits, accepted directly by hashlib's update()."""
+        return self._view[self._start:]
+
+    def increment(self):
+        """Adds one to the counter in place."""
+        buffer = self._buffer
+        i = self.MAX_DIGITS - 1
+        while buffer[i] == 0x39: # '9' rolls over to '0' and carries left
+            buffer[i] = 0x30
+            i -= 1
+        buffer[i] += 1
+        if i < self._start:
+            self._start = i
+        self.value += 1
+
+class HashEngine:
+    """
+    Hashes nonces against a fixed block template.
+    The constant block data prefix is absorbed once per job into a hashlib object,
+    so each nonce only copies that state and feeds its own digits.
+    """
+    def __init__(self, block_data: str, hasher: Optional[HasherSpec] = None):
+        self.block_data = block_data
+        self.hasher = hasher or resolve_hasher('sha256')
+        self._prefix_state = self.hasher.constructor(block_data.encode('utf-8'))
+        self.digest_size = self.hasher.digest_size
+
+    def target(self, difficulty: int, mode: str = 'hex') -> HashTarget:
+        """Builds the per-job digest target for this engine's algorithm."""
+        return self.hasher.target(difficulty, mode)
+
+    def hash_nonce(self, nonce: int):
+        """Returns the hash object for block_data + nonce, built from the prefix midstate."""
+        h = self._prefix_state.copy()
+        h.update(b'%d' % nonce) # Same bytes as f"{nonce}".encode('utf-8')
+        return h
+
+    def hexdigest(self, nonce: int) -> str:
+        """Returns the hex digest for block_data + nonce."""
+        return self.hash_nonce(nonce).hexdigest()
+
+    def iter_blocks(self, start_nonce: int, end_nonce: int) -> Iterator[Tuple[int, Any, Tuple[bytes, ...]]]:
+        """
+        Splits [start_nonce, end_nonce) into nonce blocks.
+        Yields (first_nonce, block_state, suffixes): block_state has absorbed the prefix and the
+        high-order nonce digits, and copying it then feeding suffixes[i] hashes nonce first_nonce + i.
+        """
+        nonce = start_nonce
+        high_digits = None # Consecutive blocks differ by one in their high-order digits
+        while nonce < end_nonce:
+            high, low = divmod(nonce, NONCE_BLOCK_SIZE)
+            count = min(NONCE_BLOCK_SIZE - low, end_nonce - nonce)
+            if high:
+                if high_digits is None:
+                    high_digits = NonceEncoder(high)
+                else:
+                    high_digits.increment()
+                block_state = self._prefix_state.copy()
+                block_state.update(high_digits.digits)
+                suffixes = _LOW_SUFFIXES
+            else:
+                block_state = self._prefix_state
+                suffixes = _SHORT_SUFFIXES
+            yield nonce, block_state, suffixes[low:low + count]
+            nonce += count
+
+    def search(self, start_nonce: int, end_nonce: int, target_ceiling: bytes,
+               generation: Any = None, job_id: int = 0) -> Tuple[Optional[int], int]:
+        """
+        Scans [start_nonce, end_nonce) for a digest <= target_ceiling.
+        Returns (found_nonce, stop_nonce): found_nonce is None if nothing qualified, and stop_nonce is
+        one past the last nonce hashed. If `generation` is given, the scan stops at the next nonce block
+        once generation.value no longer equals job_id, which bounds the cancellation latency.
+        """
+        for first_nonce, block_state, suffixes in self.iter_blocks(start_nonce, end_nonce):
+            if generation is not None and generation.value != job_id:
+                return None, first_nonce
+            copy_state = block_state.copy
+            for suffix in suffixes:
+                hasher = copy_state()
+                hasher.update(suffix)
+                if hasher.digest() <= target_ceiling:
+                    nonce = first_nonce + suffixes.index(suffix) # Only the winner pays for its nonce int
+                    return nonce, nonce + 1
+        return None, max(start_nonce, end_nonce)
+
+def with_extranonce(block_data: str, extranonce: int) -> str:
+    """Block template for an extranonce; extranonce 0 is the original block data."""
+    return f"{block_data}_x{extranonce}_" if extranonce else block_data
+
+def validate_hash_kernel(kernel: str) -> str:
+    """Normalizes a HASH_KERNEL value. Raises ValueError for unknown values."""
+    kernel = kernel.strip().lower()
+    if kernel not in HASH_KERNELS:
+        raise ValueError(f"Invalid hash kernel '{kernel}' (use {', '.join(HASH_KERNELS)})")
+    return kernel
+
+def create_engine(block_data: str, hasher: Optional[HasherSpec] = None, kernel: str = 'hashlib') -> HashEngine:
+    """Builds the engine for a job: 'hashlib' hashes nonce by nonce, 'numpy' hashes whole vectors of nonces."""
+    if kernel == 'numpy':
+        from .numpy_kernel import NumpySha256Engine # Optional dependency, imported on demand
+        return NumpySha256Engine(block_data, hasher)
+    return HashEngine(block_data, hasher)
@@ -0,0 +1,67 @@
+import math
+import threading
+import time
+from typing import Dict, List
+from .hash_counter import HashCounter
+
+class HashRateMeter:
+    """
+    Hash rate from the real per-worker hash counts, smoothed with exponentially weighted
+    moving averages over 10 s, 60 s and 15 min windows (like the Unix load averages).
+    sample() can be called from any thread and as often as convenient; it folds in the
+    hashes counted since the previous sample at most every MIN_INTERVAL seconds.
+    """
+    WINDOWS = (('10s', 10.0), ('60s', 60.0), ('15m', 900.0))
+    MIN_INTERVAL = 0.5 # Seconds between folded samples, shorter intervals are too noisy
+
+    def __init__(self, hash_counter: HashCounter):
+        self.hash_counter = hash_counter
+        self._lock = threading.Lock()
+        self._last_time = None
+        self._last_total = 0
+        self._last_workers = []
+        self._seeded = False # Set once hashing was first observed
+        self._rates = {name: 0.0 for name, _ in self.WINDOWS}
+        self._worker_rates = {name: [] for name, _ in self.WINDOWS}
+
+    def sample(self) -> Dict[str, float]:
+        """Folds in the hashes counted since the last sample and returns the windowed rates in H/s."""
+        with self._lock:
+            now = time.monotonic()
+            total = self.hash_counter.total()
+            workers = self.hash_counter.per_worker()
+            if self._last_time is None:
+                self._last_time, self._last_total, self._last_workers = now, total, workers
+                return dict(self._rates)
+
+            elapsed = now - self._last_time
+            if elapsed < self.MIN_INTERVAL:
+                return dict(self._rates)
+
+            rate = (total - self._last_total) / elapsed
+            if len(workers) != len(self._last_workers): # Worker pool was rebuilt
+                self._last_workers = [0] * len(workers)
+                for name, _ in self.WINDOWS:
+                    self._worker_rates[name] = [0.0] * len(workers)
+            worker_rates = [max(0, count - last) / elapsed for count, last in zip(workers, self._last_workers)]
+
+            for name, window in self.WINDOWS:
+                # Seed every window with the first real measurement instead of ramping up from zero
+                weight = 1.0 - math.exp(-elapsed / window) if self._seeded else 1.0
+                self._rates[name] += weight * (rate - self._rates[name])
+                previous = self._worker_rates[name] or [0.0] * len(worker_rates)
+                self._worker_rates[name] = [old + weight * (new - old) for old, new in zip(previous, worker_rates)]
+            self._seeded = self._seeded or rate > 0
+
+            self._last_time, self._last_total, self._last_workers = now, total, workers
+            return dict(self._rates)
+
+    def rates(self) -> Dict[str, float]:
+        """Returns the latest windowed rates without sampling."""
+        with self._lock:
+            return dict(self._rates)
+
+    def worker_rates(self, window: str = '10s') -> List[float]:
+        """Returns the per-worker rates in H/s for one window."""
+        with self._lock:
+            return list(self._worker_rates[window])
@@ -0,0 +1,37 @@
+import hashlib
+from typing import Callable, Dict
+from .target import HashTarget
+
+class HasherSpec:
+    """A pre-bound hash constructor plus the digest metadata the engine needs for target checks."""
+    def __init__(self, name: str, constructor: Callable):
+        self.name = name
+        self.constructor = constructor
+        self.digest_size = constructor().digest_size
+
+    def target(self, difficulty: int, mode: str = 'hex') -> HashTarget:
+        """Builds the digest target for this algorithm at the given difficulty."""
+        return HashTarget(difficulty, self.digest_size, mode)
+
+def _build_registry() -> Dict[str, HasherSpec]:
+    """Registers every supported algorithm that this Python build actually provides."""
+    registry = {}
+    for name in ('sha256', 'sha1', 'md5', 'sha224', 'sha384', 'sha512',
+                 'blake2b', 'blake2s', 'sha3_256', 'sha3_512'):
+        constructor = getattr(hashlib, name, None)
+        if constructor is None:
+            continue
+        try:
+            registry[name] = HasherSpec(name, constructor)
+        except ValueError: # Disabled by the platform (e.g. md5 under FIPS)
+            pass
+    return registry
+
+HASHERS = _build_registry()
+
+def resolve_hasher(name: str) -> HasherSpec:
+    """Looks up a hash algorithm by name. Raises ValueError for unknown or unavailable algorithms."""
+    hasher = HASHERS.get(name.strip().lower())
+    if hasher is None:
+        raise ValueError(f"Unsupported hash algorithm '{name}' (available: {', '.join(sorted(HASHERS))})")
+    return hasher
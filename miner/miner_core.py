@@ -1,19 +1,50 @@
-import hashlib
 import time
 import random
 import threading
 import os
 import psutil # Import psutil for PID checking
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, Dict, Any
+import zlib
+from typing import Optional, Dict, Any, Callable, Iterator
 from .logger import Logger
 from .config import MinerConfig
+from .affinity import plan_affinity
+from .difficulty import DifficultyController
+from .hash_counter import HashCounter
+from .hash_rate_meter import HashRateMeter
+from .hash_engine import HashEngine
+from .nonce_dispenser import NonceDispenser
+from .numpy_kernel import numpy_available, probe_fastest_kernel
+from .priority import priority_ignored
+from .process_backend import ProcessMiningBackend
+from .runtime import gil_enabled, resolve_backend
+from .target import format_difficulty
+from .thread_backend import JobGeneration, ThreadMiningBackend
+from .throttle import DutyCycleThrottle
+from .work_unit import run_work_unit
+
+class _MiningFlags:
+    """Job-generation view of the mining/pause/shutdown flags, so standalone runs stop like pooled ones."""
+    def __init__(self, miner_core, job_id: int):
+        self.miner_core = miner_core
+        self.job_id = job_id
+
+    @property
+    def value(self) -> int:
+        core = self.miner_core
+        return self.job_id if core.mining_active and not core.shutdown_requested and not core.paused else 0
 
 class MinerCore:
     """Encapsulates the core hashing and mining logic."""
     
     # Define a PID file path. It will be created in the current working directory.
     PID_FILE = 'phonesium_miner.pid'
+    # Upper bound on how long a stopped job may wait for its workers to acknowledge
+    STOP_WAIT_TIMEOUT = 1.0
+    # Extranonce rolls allowed per job; in practice the mining timeout ends a job long before this
+    MAX_EXTRANONCE = 1000000
+    # measure_throughput: how often the worker slots are sampled, and the longest wait for a fresh pool to warm up
+    MEASURE_POLL_INTERVAL = 0.002
+    MEASURE_WARMUP_TIMEOUT = 5.0
 
     def __init__(self, config: MinerConfig, logger: Logger, stats_lock: threading.Lock, stats: Dict[str, Any]):
         self.config = config
@@ -23,7 +54,11 @@ class MinerCore:
         self.mining_active = False # Controlled by the main app
         self.shutdown_requested = False # Controlled by the main app
         self.paused = False # Controlled by the main app
-        self.last_hash_rates = [] # For auto-difficulty
+        self.difficulty_controller = DifficultyController(config)
+        self._backend = None # Persistent worker pool, started on first use and reused across jobs
+        self.hash_counter = HashCounter() # Per-worker hash counts, aggregated on read
+        self.hash_rate_meter = HashRateMeter(self.hash_counter)
+        self._preempted_at = None # Time of the last pause/shutdown preemption of the running job
         
         # Single instance enforcement
         self._is_locked = False
@@ -76,151 +111,348 @@ class MinerCore:
 
     def calculate_hash(self, data: str, nonce: int) -> str:
         """Calculates the hash for given data and nonce using configured algorithm."""
-        message = f"{data}{nonce}".encode('utf-8')
-        hash_algorithm = os.getenv('HASH_ALGORITHM', 'sha256').lower()
-        
-        if hash_algorithm == 'sha256':
-            return hashlib.sha256(message).hexdigest()
-        elif hash_algorithm == 'sha1':
-            return hashlib.sha1(message).hexdigest()
-        elif hash_algorithm == 'md5':
-            return hashlib.md5(message).hexdigest()
-        else:
-            return hashlib.sha256(message).hexdigest() # Default fallback
-
-    def is_valid_hash(self, hash_value: str, difficulty: int) -> bool:
-        """Checks if a hash meets the current difficulty requirement."""
-        if not hash_value or len(hash_value) < difficulty:
+        return HashEngine(data, self.config.hasher).hexdigest(nonce)
+
+    def is_valid_hash(self, hash_value: str, difficulty: int, mode: str = 'hex') -> bool:
+        """Checks if a hex hash meets the difficulty requirement (`mode` as in DIFFICULTY_MODE)."""
+        if mode == 'hex':
+            if not hash_value or len(hash_value) < difficulty:
+                return False
+            return hash_value.startswith('0' * difficulty)
+        try:
+            digest = bytes.fromhex(hash_value)
+        except (TypeError, ValueError):
             return False
-        return hash_value.startswith('0' * difficulty)
+        return len(digest) == self.config.hasher.digest_size and self.config.hasher.target(difficulty, mode).is_met(digest)
 
     def adjust_difficulty(self):
-        """Auto-adjusts difficulty based on recent hash rates."""
-        if not self.config.auto_difficulty:
+        """Auto-adjusts difficulty towards TARGET_BLOCK_TIME from the measured 60 s hash rate."""
+        if not self.config.auto_difficulty or self.config.difficulty_mode == 'target':
             return
         
-        with self.stats_lock:
-            if len(self.last_hash_rates) >= 5:
-                avg_rate = sum(self.last_hash_rates) / len(self.last_hash_rates)
-                
-                if avg_rate > 1000000 and self.config.difficulty < 8:
-                    self.config.difficulty += 1
-                    self.logger.log('INFO', f"Difficulty increased to {self.config.difficulty}")
-                elif avg_rate < 100000 and self.config.difficulty > 3:
-                    self.config.difficulty -= 1
-                    self.logger.log('INFO', f"Difficulty decreased to {self.config.difficulty}")
-
-    def generate_block_data(self, user_id: int) -> str:
-        """Generates unique block data for mining."""
-        timestamp = int(time.time())
+        hash_rate = self.hash_rate_meter.rates()['60s']
+        difficulty = self.difficulty_controller.next_difficulty(self.config.difficulty, hash_rate)
+        if difficulty != self.config.difficulty:
+            expected = self.difficulty_controller.expected_block_time(difficulty, hash_rate)
+            self.logger.log('INFO', f"Difficulty {self.config.difficulty} -> {format_difficulty(difficulty, self.config.difficulty_mode)}: ~{expected:.0f}s per block "
+                                    f"at {hash_rate:.0f} H/s (target {self.config.target_block_time:.0f}s)")
+            self.config.difficulty = difficulty
+
+    def generate_block_data(self, user_id: int, timestamp: Optional[int] = None, session_start: Optional[float] = None) -> str:
+        """
+        Generates unique block data for mining. A fixed `timestamp`, `session_start` and random seed
+        reproduce a template (used by the offline benchmark).
+        """
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        session_start = self.stats['start_time'] if session_start is None else session_start
         random_data = random.randint(1000000, 9999999)
-        # Use a stable session ID based on miner start time for consistency
-        session_id = hash(str(self.stats['start_time'])) % 1000000
+        # Use a stable session ID based on miner start time for consistency (crc32 is stable across processes)
+        session_id = zlib.crc32(str(session_start).encode('utf-8')) % 1000000
         return f"phonesium_{timestamp}_{random_data}_{user_id}_{session_id}"
 
-    def mine_block_thread(self, block_data: str, start_nonce: int, nonce_range: int, thread_id: int) -> Optional[Dict[str, Any]]:
-        """Individual mining thread function."""
-        nonce = start_nonce
-        end_nonce = start_nonce + nonce_range
-        hashes_computed = 0
-        thread_start_time = time.time()
+    def mine_block_thread(self, block_data: str, start_nonce: int, nonce_range: int, thread_id: int,
+                          generation: Optional[JobGeneration] = None, job_id: int = 0,
+                          dispenser: Optional[NonceDispenser] = None,
+                          on_solution: Optional[Callable[[Dict[str, Any]], None]] = None,
+                          difficulty: Optional[int] = None, difficulty_mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Individual mining thread function. Hashes [start_nonce, start_nonce + nonce_range), or with a
+        `dispenser`, batch-sized chunks claimed from it until its nonce space is used up, switching
+        to the rolled template whenever the dispenser advances the extranonce.
+        Returns the first solution, unless `on_solution` is given: then every solution is passed to it
+        and the search goes on. Pooled runs (with `generation`) stop once it no longer holds `job_id`,
+        standalone runs when the mining/pause/shutdown flags say so.
+        """
+        if dispenser is None: # Standalone range, handed out by a private dispenser
+            job_id = job_id or 1
+            dispenser = NonceDispenser()
+            dispenser.reset(job_id, start_nonce, start_nonce + nonce_range)
+        if generation is None:
+            generation = _MiningFlags(self, job_id)
+        if difficulty is None:
+            difficulty = self.config.difficulty
+            difficulty_mode = difficulty_mode or self.config.difficulty_mode
+        unit = {
+            'job_id': job_id,
+            'block_data': block_data,
+            'algorithm': self.config.hasher.name,
+            'kernel': self.config.hash_kernel,
+            'difficulty': difficulty,
+            'difficulty_mode': difficulty_mode or 'hex',
+            'cpu_limit': self.config.cpu_limit,
+            'continuous': on_solution is not None
+        }
+        solutions = []
+        self.hash_counter.ensure_slots(thread_id + 1)
+        try:
+            run_work_unit(unit, thread_id, generation, dispenser, self.config.hash_batch_size, self.hash_counter.slots,
+                          on_solution or solutions.append)
+        except Exception as e:
+            self.logger.log('ERROR', f"Mining thread {thread_id} error: {e}")
+        return solutions[0] if solutions else None
+
+    def _record_solution(self, result: Dict[str, Any], start_time: float, hashes_before: int):
+        """Updates hash rate statistics and logs a found block."""
+        mining_time = time.time() - start_time
+        rates = self.hash_rate_meter.sample() # Measured over all workers
+        hash_rate = rates['10s']
+        if hash_rate <= 0 and mining_time > 0: # The meter has no sample yet, use this job's own count
+            hash_rate = (self.hash_counter.total() - hashes_before) / mining_time
+        
+        with self.stats_lock:
+            self.stats['hash_rate'] = hash_rate
+            self.stats['best_hash_rate'] = max(self.stats['best_hash_rate'], rates['60s'])
+        
+        self.logger.log('SUCCESS', f"Block found! Hash: {result['hash'][:16]}...")
+        self.logger.log('SUCCESS', f"Nonce: {result['nonce']:,} | Time: {mining_time:.2f}s | Rate: {hash_rate:.0f} H/s")
+
+    def _run_thread_unit(self, unit: Dict[str, Any], worker_id: int, generation: JobGeneration,
+                         dispenser: NonceDispenser, report: Callable[[Dict[str, Any]], None],
+                         throttle: DutyCycleThrottle) -> Optional[Dict[str, Any]]:
+        """Runs one work unit on a pooled hashing thread, pulling its nonces from the dispenser."""
+        run_work_unit(unit, worker_id, generation, dispenser, self.config.hash_batch_size, self.hash_counter.slots, report,
+                      throttle)
+        return None # Solutions were already reported
+
+    def _resolve_hash_kernel(self):
+        """Picks the batch hashing kernel once: 'auto' runs a short probe of hashlib vs NumPy."""
+        kernel = self.config.hash_kernel
+        if kernel == 'numpy' and not (numpy_available() and self.config.hasher.name == 'sha256'):
+            self.logger.log('WARNING', "NumPy kernel needs NumPy and sha256, using hashlib")
+            kernel = 'hashlib'
+        elif kernel == 'auto':
+            kernel, rates = probe_fastest_kernel(self.config.hasher)
+            if rates:
+                self.logger.log('INFO', f"Kernel probe: hashlib {rates['hashlib']:.0f} H/s, numpy {rates['numpy']:.0f} H/s -> {kernel}")
+        self.config.hash_kernel = kernel
+
+    def _get_backend(self):
+        """Returns the persistent worker pool, (re)starting it if the configuration changed."""
+        if self.config.hash_kernel not in ('hashlib', 'numpy'):
+            self._resolve_hash_kernel()
+        # Resolved after the kernel probe: importing NumPy can re-enable the GIL on a free-threaded build
+        backend_kind = resolve_backend(self.config.backend)
+        cpus = plan_affinity(self.config.cpu_affinity, self.config.threads)
+        backend = self._backend
+        if backend:
+            if backend_kind == 'process':
+                stale = not isinstance(backend, ProcessMiningBackend) or backend.batch_size != self.config.hash_batch_size
+            else:
+                stale = not isinstance(backend, ThreadMiningBackend)
+            if (stale or backend.workers != self.config.threads or backend.cpus != cpus
+                    or backend.priority != self.config.priority):
+                backend.shutdown()
+                backend = None
+        if backend is None:
+            if self.config.backend == 'auto':
+                runtime = "GIL enabled" if gil_enabled() else "free-threaded, GIL disabled"
+                worker_kind = 'processes' if backend_kind == 'process' else 'threads'
+                self.logger.log('INFO', f"Backend auto: hashing in {worker_kind} ({runtime})")
+            if backend_kind == 'process':
+                backend = ProcessMiningBackend(self.config.threads, self.config.hash_batch_size, cpus,
+                                               self.config.priority, self.config.low_priority_nice)
+            else:
+                if priority_ignored(self.config.priority, process_workers=False):
+                    self.logger.log('WARNING', f"PRIORITY={self.config.priority} is ignored for hashing threads that share the GIL "
+                                               f"with the network threads; use MINING_BACKEND=process to lower it")
+                backend = ThreadMiningBackend(self.config.threads, self._run_thread_unit, cpus,
+                                              self.config.priority, self.config.low_priority_nice)
+            if any(cpu is not None for cpu in cpus):
+                self.logger.log('INFO', f"Pinning workers to CPUs {cpus} ({self.config.cpu_affinity})")
+            backend.start()
+            self.hash_counter.attach(backend.hash_slots)
+            self._backend = backend
+        return backend
+
+    def _mine_block_pool(self, block_data: str, start_time: float, continuous: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Hands the job to the persistent worker pool and yields solutions as they arrive: only the first
+        one, or with `continuous` every one until the timeout or preemption. The job is stopped when the
+        generator finishes or is closed.
+        """
+        backend = self._get_backend()
+        self._preempted_at = None
+        hashes_before = self.hash_counter.total()
+        # One shared range for the whole job, handed out in chunks so no nonce is hashed twice
+        # It rolls the extranonce when the range is used up, so the job only ends on a solution, timeout or preemption
+        job_id = backend.start_job(block_data, self.config.hasher.name, self.config.hash_kernel, self.config.difficulty,
+                                   self.config.nonce_range * backend.workers, self.config.cpu_limit, self.MAX_EXTRANONCE,
+                                   continuous, self.config.difficulty_mode)
+        deadline = start_time + self.config.mining_timeout
+        workers_done = 0
+        done_times = [] # When each worker ran out of nonces
         
         try:
-            while self.mining_active and nonce < end_nonce and not self.shutdown_requested and not self.paused:
-                batch_end = min(nonce + self.config.hash_batch_size, end_nonce)
-                
-                for batch_nonce in range(nonce, batch_end):
-                    if not self.mining_active or self.shutdown_requested or self.paused:
-                        return None
-                    
-                    block_hash = self.calculate_hash(block_data, batch_nonce)
-                    hashes_computed += 1
-                    
-                    with self.stats_lock:
-                        self.stats['total_hashes'] += 1
-                    
-                    if self.is_valid_hash(block_hash, self.config.difficulty):
-                        thread_time = time.time() - thread_start_time
-                        thread_hash_rate = hashes_computed / thread_time if thread_time > 0 else 0
-                        
-                        return {
-                            'hash': block_hash,
-                            'nonce': batch_nonce,
-                            'thread_id': thread_id,
-                            'hashes_computed': hashes_computed,
-                            'thread_hash_rate': thread_hash_rate,
-                            'thread_time': thread_time
-                        }
+            while self.mining_active and not self.shutdown_requested and not self.paused:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.logger.log('INFO', f"No solution found in {self.config.mining_timeout}s, generating new job...")
+                    break
                 
-                nonce = batch_end
+                message = backend.get_message(timeout=min(remaining, 0.5))
+                self.hash_rate_meter.sample()
+                if message is None:
+                    continue
+                kind, worker_id, message_job, payload = message
+                if message_job != job_id: # Leftover from a previous job
+                    continue
                 
-                if self.config.cpu_limit < 100:
-                    time.sleep(0.001 * (100 - self.config.cpu_limit) / 100)
-            
-            return None
+                if kind == 'solution':
+                    yield payload
+                    if not continuous:
+                        break
+                elif kind == 'error':
+                    self.logger.log('ERROR', f"Mining worker {worker_id} error: {payload}")
+                elif kind == 'done':
+                    workers_done += 1
+                    done_times.append(time.time())
+                    if workers_done == backend.workers:
+                        break
         except Exception as e:
-            self.logger.log('ERROR', f"Mining thread {thread_id} error: {e}")
-            return None
+            self.logger.log('ERROR', f"Mining execution error: {e}")
+        finally:
+            job_end = time.time()
+            # Preempt the remaining workers, the pool itself stays up
+            self._stop_job(backend, job_id, backend.workers - workers_done)
+            self._record_job_efficiency(backend, hashes_before, sum(job_end - t for t in done_times))
+
+    def _record_job_efficiency(self, backend, hashes_before: int, idle_seconds: float):
+        """Records duplicate work (hashes beyond the distinct nonces dispensed), extranonce rolls and worker idle time for a job."""
+        job_hashes = self.hash_counter.total() - hashes_before
+        duplicate_hashes = max(0, job_hashes - backend.dispenser.claimed())
+        with self.stats_lock:
+            self.stats['duplicate_hashes'] += duplicate_hashes
+            self.stats['extranonce_rolls'] += backend.dispenser.extranonce()
+            self.stats['worker_idle_seconds'] += idle_seconds
+
+    def _stop_job(self, backend, job_id: int, workers_running: int):
+        """Cancels a job and waits (bounded) for its workers to stop, recording the stop latency."""
+        if workers_running <= 0:
+            backend.cancel_job()
+            return
+        stop_latency_ms = self._cancel_and_wait(backend, job_id, workers_running, self._preempted_at or time.time())
+        with self.stats_lock:
+            self.stats['stop_latency_ms'] = stop_latency_ms
+            self.stats['max_stop_latency_ms'] = max(self.stats['max_stop_latency_ms'], stop_latency_ms)
+
+    def _cancel_and_wait(self, backend, job_id: int, workers_running: int, stop_requested_at: float) -> float:
+        """Cancels a job, waits up to STOP_WAIT_TIMEOUT for its workers to acknowledge and returns the stop latency in ms."""
+        backend.cancel_job()
+        deadline = stop_requested_at + self.STOP_WAIT_TIMEOUT
+        while workers_running > 0:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.logger.log('WARNING', f"{workers_running} mining workers did not stop within {self.STOP_WAIT_TIMEOUT:.1f}s")
+                break
+            message = backend.get_message(timeout=remaining)
+            if message is None:
+                continue
+            kind, worker_id, message_job, payload = message
+            if message_job != job_id:
+                continue
+            if kind == 'done':
+                workers_running -= 1
+        return (time.time() - stop_requested_at) * 1000
+
+    def measure_throughput(self, seconds: float, block_data: str = "phonesium_calibration",
+                           difficulty: Optional[int] = None, difficulty_mode: str = 'hex') -> Dict[str, float]:
+        """
+        Hashes `block_data` on the worker pool of the current configuration for `seconds`, then cancels the
+        job. Without a `difficulty` the target is unreachable; otherwise workers keep going past solutions.
+        Workers add to their slot once per batch, so each worker's rate is taken between batch boundaries:
+        from its first batch (which also waits out the start-up of a fresh pool) to its last one inside the
+        window, extended until every worker has finished a batch in it. Larger batches are therefore not
+        penalised for the batch still running when the window closes.
+        Returns {'hash_rate': H/s, 'stop_latency_ms': ms}; no stats are recorded.
+        """
+        backend = self._get_backend()
+        if difficulty is None:
+            difficulty, difficulty_mode = self.config.hasher.digest_size * 2, 'hex' # Only an all-zero digest would qualify
+        counts = self.hash_counter.per_worker()
+        first = [None] * len(counts) # (time, count) at each worker's first batch boundary
+        last = [None] * len(counts) # ... and at its latest one
+        job_id = backend.start_job(block_data, self.config.hasher.name, self.config.hash_kernel, difficulty,
+                                   self.config.nonce_range * backend.workers, self.config.cpu_limit, self.MAX_EXTRANONCE,
+                                   continuous=True, difficulty_mode=difficulty_mode)
+        start_time = time.perf_counter()
+        warmup_deadline = start_time + self.MEASURE_WARMUP_TIMEOUT
+        end_time = None
+        while True:
+            time.sleep(self.MEASURE_POLL_INTERVAL)
+            now = time.perf_counter()
+            for worker_id, count in enumerate(self.hash_counter.per_worker()):
+                if count != counts[worker_id]:
+                    counts[worker_id] = count
+                    if first[worker_id] is None:
+                        first[worker_id] = (now, count)
+                    else:
+                        last[worker_id] = (now, count)
+            if end_time is None: # Warming up until every worker has finished its first batch
+                if all(first) or now >= warmup_deadline:
+                    end_time = now + seconds
+                continue
+            if now >= end_time + seconds or (now >= end_time and all(last)):
+                break
+        stop_latency_ms = self._cancel_and_wait(backend, job_id, backend.workers, time.time())
+        hash_rate = sum((end[1] - begin[1]) / (end[0] - begin[0]) for begin, end in zip(first, last) if begin and end)
+        return {'hash_rate': hash_rate, 'stop_latency_ms': stop_latency_ms}
+
+    def preempt(self):
+        """Stops the running job at the workers' next nonce block (pause, shutdown signals)."""
+        if self._backend:
+            self._preempted_at = time.time()
+            self._backend.cancel_job()
 
     def mine_block(self, block_data: str) -> Optional[Dict[str, Any]]:
-        """Manages multi-threaded block mining."""
+        """Manages multi-threaded or multi-process block mining."""
         # Check lock status before starting a new mining block
         if not self._is_locked:
             self.logger.log('ERROR', "MinerCore lock not acquired. Cannot start mining.")
             return None
 
-        self.logger.log('INFO', f"Mining with {self.config.threads} threads (Difficulty: {self.config.difficulty})")
+        worker_kind = 'processes' if resolve_backend(self.config.backend) == 'process' else 'threads'
+        self.logger.log('INFO', f"Mining with {self.config.threads} {worker_kind} "
+                                f"(Difficulty: {format_difficulty(self.config.difficulty, self.config.difficulty_mode)})")
         
         start_time = time.time()
-        solution_found = False
+        hashes_before = self.hash_counter.total()
+        solutions = self._mine_block_pool(block_data, start_time)
+        result = next(solutions, None)
+        solutions.close() # Stops the job
         
-        with ThreadPoolExecutor(max_workers=self.config.threads) as executor:
-            futures = []
-            for i in range(self.config.threads):
-                start_nonce = i * self.config.nonce_range + random.randint(0, 100000)
-                future = executor.submit(
-                    self.mine_block_thread,
-                    block_data,
-                    start_nonce,
-                    self.config.nonce_range,
-                    i
-                )
-                futures.append(future)
-            
-            try:
-                for future in as_completed(futures, timeout=self.config.mining_timeout):
-                    if not self.mining_active or self.shutdown_requested:
-                        break
-                    
-                    result = future.result()
-                    if result and not solution_found:
-                        solution_found = True
-                        for f in futures: # Cancel remaining futures
-                            if not f.done():
-                                f.cancel()
-                        
-                        mining_time = time.time() - start_time
-                        hash_rate = result['nonce'] / mining_time if mining_time > 0 else 0
-                        
-                        with self.stats_lock:
-                            self.stats['hash_rate'] = hash_rate
-                            self.stats['best_hash_rate'] = max(self.stats['best_hash_rate'], hash_rate)
-                            self.last_hash_rates.append(hash_rate)
-                            if len(self.last_hash_rates) > 10:
-                                self.last_hash_rates.pop(0)
-                        
-                        self.logger.log('SUCCESS', f"Block found! Hash: {result['hash'][:16]}...")
-                        self.logger.log('SUCCESS', f"Nonce: {result['nonce']:,} | Time: {mining_time:.2f}s | Rate: {hash_rate:.0f} H/s")
-                        
-                        self.adjust_difficulty()
-                        return result
-                
-                if not solution_found and self.mining_active and not self.shutdown_requested:
-                    self.logger.log('INFO', f"No solution found in {self.config.mining_timeout}s, generating new job...")
-            except Exception as e:
-                self.logger.log('ERROR', f"Mining execution error: {e}")
-            finally:
-                for f in futures:
-                    if not f.done():
-                        f.cancel()
-            return None
+        if result:
+            self._record_solution(result, start_time, hashes_before)
+        # Also after a timeout, so a difficulty that is too high for this host comes down
+        self.adjust_difficulty()
+        return result
+
+    def iter_solutions(self, block_data: str) -> Iterator[Dict[str, Any]]:
+        """
+        Streams every solution of one template: the workers keep searching after each find, until the
+        mining timeout, a preemption, or the caller stops iterating (closing the generator stops the job).
+        """
+        if not self._is_locked:
+            self.logger.log('ERROR', "MinerCore lock not acquired. Cannot start mining.")
+            return
+
+        worker_kind = 'processes' if resolve_backend(self.config.backend) == 'process' else 'threads'
+        self.logger.log('INFO', f"Continuous mining with {self.config.threads} {worker_kind} "
+                                f"(Difficulty: {format_difficulty(self.config.difficulty, self.config.difficulty_mode)})")
+        
+        start_time = time.time()
+        hashes_before = self.hash_counter.total()
+        solutions = self._mine_block_pool(block_data, start_time, continuous=True)
+        try:
+            for result in solutions:
+                self._record_solution(result, start_time, hashes_before)
+                yield result
+        finally:
+            solutions.close()
+            self.adjust_difficulty()
+
+    def shutdown(self):
+        """Stops the persistent worker pool, if it was started."""
+        if self._backend:
+            self._backend.shutdown()
+            self.hash_counter.attach([])
+            self._backend = None
@@ -0,0 +1,67 @@
+import threading
+from typing import Any, Optional, Tuple
+
+class NonceDispenser:
+    """
+    Central source of nonces for a job. Workers claim small chunks on demand, so every nonce of
+    the job's range is handed out exactly once and fast workers keep pulling work while slow
+    ones finish their current chunk (work stealing without per-worker ranges).
+
+    When the range is used up the dispenser rolls the job's extranonce and starts the range
+    over, so the job keeps going on a new template (see with_extranonce) without a restart,
+    up to `max_extranonce` rolls.
+
+    The state lives in a small array guarded by one lock; a plain list and threading.Lock
+    serve threads, a shared RawArray and multiprocessing Lock serve worker processes.
+    """
+    _JOB, _CURSOR, _END, _START, _EXTRANONCE, _MAX_EXTRANONCE = range(6)
+
+    def __init__(self, lock: Any = None, state: Any = None):
+        self._lock = lock if lock is not None else threading.Lock()
+        self._state = state if state is not None else [0] * 6
+
+    @classmethod
+    def shared(cls, context) -> 'NonceDispenser':
+        """Builds a dispenser that can be handed to worker processes of `context`."""
+        return cls(context.Lock(), context.RawArray('q', 6))
+
+    def reset(self, job_id: int, start_nonce: int, end_nonce: int, max_extranonce: int = 0):
+        """Starts dispensing [start_nonce, end_nonce) for `job_id`; chunks of older jobs are no longer handed out."""
+        with self._lock:
+            state = self._state
+            state[self._JOB] = job_id
+            state[self._CURSOR] = start_nonce
+            state[self._END] = end_nonce
+            state[self._START] = start_nonce
+            state[self._EXTRANONCE] = 0
+            state[self._MAX_EXTRANONCE] = max_extranonce
+
+    def claim(self, job_id: int, chunk_size: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Returns the next unclaimed (extranonce, start, end) chunk of `job_id`, or None once the
+        range is used up under the last allowed extranonce.
+        """
+        with self._lock:
+            state = self._state
+            if state[self._JOB] != job_id:
+                return None
+            start = state[self._CURSOR]
+            if start >= state[self._END]:
+                if state[self._EXTRANONCE] >= state[self._MAX_EXTRANONCE]:
+                    return None
+                state[self._EXTRANONCE] += 1 # Roll the template and start the range over
+                start = state[self._START]
+            end = min(start + chunk_size, state[self._END])
+            state[self._CURSOR] = end
+            return state[self._EXTRANONCE], start, end
+
+    def claimed(self) -> int:
+        """Number of distinct (extranonce, nonce) pairs handed out for the current job."""
+        with self._lock:
+            state = self._state
+            return state[self._EXTRANONCE] * (state[self._END] - state[self._START]) + state[self._CURSOR] - state[self._START]
+
+    def extranonce(self) -> int:
+        """Current extranonce of the job, i.e. how many times its range was rolled over."""
+        with self._lock:
+            return self._state[self._EXTRANONCE]
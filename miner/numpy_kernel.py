@@ -0,0 +1,169 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .hash_engine import HashEngine
+from .hashers import HasherSpec
+
+# Optional dependency, imported on first use (see _load_numpy) so HASH_KERNEL=hashlib never loads it:
+# on a free-threaded build a NumPy without free-threading support would re-enable the GIL
+np = None
+
+_K = (
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+)
+_K32 = () # _K as numpy.uint32, built when NumPy is loaded
+_H0 = (0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19)
+
+def _load_numpy() -> bool:
+    """Imports NumPy on first use. Returns False if it is not installed."""
+    global np, _K32
+    if np is None:
+        try:
+            import numpy
+        except ImportError: # The hashlib kernel is used without it
+            return False
+        _K32 = tuple(numpy.uint32(k) for k in _K)
+        np = numpy # Set last, so other threads never see NumPy without _K32
+    return True
+
+def numpy_available() -> bool:
+    """True if NumPy can be imported on this host (importing it)."""
+    return _load_numpy()
+
+def _rotr(x, n: int):
+    return (x >> n) | (x << (32 - n))
+
+def _compress(state: List[Any], words) -> List[Any]:
+    """SHA-256 compression of one 64-byte block per row of `words` (N x 16 uint32), vectorized over N."""
+    w = list(words.T) # 16 arrays of N words
+    for i in range(16, 64):
+        w15 = w[i - 15]
+        w2 = w[i - 2]
+        s0 = _rotr(w15, 7) ^ _rotr(w15, 18) ^ (w15 >> 3)
+        s1 = _rotr(w2, 17) ^ _rotr(w2, 19) ^ (w2 >> 10)
+        w.append(w[i - 16] + s0 + w[i - 7] + s1)
+
+    a, b, c, d, e, f, g, h = state
+    for i in range(64):
+        t1 = h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)) + ((e & f) ^ (~e & g)) + _K32[i] + w[i]
+        t2 = (_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)) + ((a & b) ^ (a & c) ^ (b & c))
+        h, g, f, e, d, c, b, a = g, f, e, d + t1, c, b, a, t1 + t2
+    return [s + x for s, x in zip(state, (a, b, c, d, e, f, g, h))]
+
+class NumpySha256Engine(HashEngine):
+    """
+    HashEngine whose search() computes SHA-256 for thousands of nonces at once with NumPy
+    uint32 array operations. The compression rounds start from the per-job midstate of the
+    prefix's full 64-byte blocks, and difficulty is checked on the final state words directly.
+    Single-nonce helpers (hexdigest, hash_nonce) still use hashlib.
+    """
+    VECTOR_SIZE = 8192 # Nonces per vector; also the preemption check interval
+
+    def __init__(self, block_data: str, hasher: Optional[HasherSpec] = None):
+        super().__init__(block_data, hasher)
+        if not _load_numpy():
+            raise RuntimeError("NumPy is not installed")
+        if self.hasher.name != 'sha256':
+            raise ValueError(f"The NumPy kernel only supports sha256, not {self.hasher.name}")
+
+        prefix = block_data.encode('utf-8')
+        full_blocks = len(prefix) // 64
+        self._prefix_length = len(prefix)
+        self._tail = prefix[full_blocks * 64:] # Prefix bytes that share a block with the nonce digits
+        # One-element arrays broadcast against the batch and wrap silently (numpy scalars warn on overflow)
+        self._midstate = [np.array([x], dtype=np.uint32) for x in _H0]
+        for i in range(full_blocks):
+            words = np.frombuffer(prefix[i * 64:(i + 1) * 64], dtype='>u4').astype(np.uint32).reshape(1, 16)
+            self._midstate = _compress(self._midstate, words)
+        self._templates = {} # Padded tail block(s) per nonce digit count
+        self._ceilings = {}
+
+    def _template(self, digit_count: int):
+        """Padded final block(s) for nonces with `digit_count` digits, with the digits left as zeros."""
+        template = self._templates.get(digit_count)
+        if template is None:
+            tail_length = len(self._tail) + digit_count
+            message_bits = (self._prefix_length + digit_count) * 8
+            padded_length = (tail_length + 9 + 63) // 64 * 64
+            data = self._tail + bytes(digit_count) + b'\x80'
+            data += bytes(padded_length - len(data) - 8) + message_bits.to_bytes(8, 'big')
+            template = np.frombuffer(data, dtype=np.uint8)
+            self._templates[digit_count] = template
+        return template
+
+    def _ceiling_words(self, target_ceiling: bytes):
+        words = self._ceilings.get(target_ceiling)
+        if words is None:
+            words = [np.uint32(int.from_bytes(target_ceiling[i:i + 4], 'big')) for i in range(0, 32, 4)]
+            self._ceilings[target_ceiling] = words
+        return words
+
+    def hash_states(self, first_nonce: int, count: int) -> List[Any]:
+        """Final SHA-256 state words (8 arrays) for nonces first_nonce..first_nonce+count-1 of equal digit count."""
+        digit_count = len(b'%d' % first_nonce)
+        template = self._template(digit_count)
+        messages = np.empty((count, template.size), dtype=np.uint8)
+        messages[:] = template
+
+        nonces = np.arange(first_nonce, first_nonce + count, dtype=np.uint64)
+        offset = len(self._tail)
+        for position in range(digit_count - 1, -1, -1): # Least significant digit last
+            nonces, digit = np.divmod(nonces, np.uint64(10))
+            messages[:, offset + position] = digit.astype(np.uint8) + 0x30
+
+        words = messages.view('>u4').astype(np.uint32)
+        state = self._midstate
+        for block in range(words.shape[1] // 16):
+            state = _compress(state, words[:, block * 16:(block + 1) * 16])
+        return state
+
+    def search(self, start_nonce: int, end_nonce: int, target_ceiling: bytes,
+               generation: Any = None, job_id: int = 0) -> Tuple[Optional[int], int]:
+        """Vectorized HashEngine.search: same contract, preemption checked once per vector."""
+        ceiling = self._ceiling_words(target_ceiling)
+        nonce = start_nonce
+        while nonce < end_nonce:
+            if generation is not None and generation.value != job_id:
+                return None, nonce
+            # A vector never spans a change in digit count, so all its messages share one template
+            vector_end = min(end_nonce, nonce + self.VECTOR_SIZE, 10 ** len(b'%d' % nonce))
+            state = self.hash_states(nonce, vector_end - nonce)
+
+            # Lexicographic state <= ceiling, word by word
+            below = np.zeros(vector_end - nonce, dtype=bool)
+            equal = np.ones(vector_end - nonce, dtype=bool)
+            for word, limit in zip(state, ceiling):
+                below |= equal & (word < limit)
+                equal &= word == limit
+            hits = np.flatnonzero(below | equal)
+            if hits.size:
+                found_nonce = nonce + int(hits[0])
+                return found_nonce, found_nonce + 1
+            nonce = vector_end
+        return None, max(start_nonce, end_nonce)
+
+def probe_fastest_kernel(hasher: HasherSpec, sample_size: int = 32768) -> Tuple[str, Dict[str, float]]:
+    """
+    Times the hashlib and NumPy kernels on the same nonces and returns (fastest_kernel, rates),
+    where rates maps kernel name to measured H/s. Falls back to hashlib when NumPy can't be used.
+    """
+    if hasher.name != 'sha256' or not _load_numpy():
+        return 'hashlib', {}
+
+    block_data = "phonesium_1700000000_4821937_123_654321"
+    unreachable = bytes(hasher.digest_size) # Only an all-zero digest would qualify, so the whole sample is hashed
+    start_nonce = 1000000
+    rates = {}
+    for kernel, engine in (('hashlib', HashEngine(block_data, hasher)), ('numpy', NumpySha256Engine(block_data, hasher))):
+        engine.search(start_nonce, start_nonce + 1000, unreachable) # Warm-up
+        start_time = time.perf_counter()
+        engine.search(start_nonce, start_nonce + sample_size, unreachable)
+        elapsed = time.perf_counter() - start_time
+        rates[kernel] = sample_size / elapsed if elapsed > 0 else 0
+    return max(rates, key=rates.get), rates
@@ -0,0 +1,51 @@
+import os
+import sys
+import threading
+import psutil
+from .runtime import gil_enabled
+
+# Scheduling classes for the hashing workers; the main, submission and network threads keep normal priority
+PRIORITIES = ('normal', 'low', 'idle')
+
+def validate_priority(priority: str) -> str:
+    """Normalizes a PRIORITY value. Raises ValueError for unknown values."""
+    priority = priority.strip().lower()
+    if priority not in PRIORITIES:
+        raise ValueError(f"Invalid priority '{priority}' (use {', '.join(PRIORITIES)})")
+    return priority
+
+def apply_worker_priority(priority: str, nice_level: int = 10, process_worker: bool = False) -> bool:
+    """
+    Lowers the scheduling priority of the calling hashing worker. 'idle' uses SCHED_IDLE (falling
+    back to nice 19), 'low' uses `nice_level`. On Linux only the calling thread is changed; other
+    platforms can only renice whole processes (priority classes on Windows), so there it applies
+    to worker processes alone.
+    Hashing threads that share a GIL with the submission and network threads are left alone:
+    a starved low-priority thread holding the GIL would stall those as well (priority inversion).
+    Returns False if the priority could not (or must not) be lowered.
+    """
+    if priority == 'normal':
+        return True
+    if priority_ignored(priority, process_worker):
+        return False
+    try:
+        if sys.platform.startswith('linux'):
+            if priority == 'idle' and hasattr(os, 'SCHED_IDLE'):
+                os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0)) # pid 0 is the calling thread
+                return True
+            nice = 19 if priority == 'idle' else nice_level
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice) # Per thread on Linux
+            return True
+        if process_worker:
+            if sys.platform == 'win32':
+                psutil.Process().nice(psutil.IDLE_PRIORITY_CLASS if priority == 'idle' else psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            else:
+                os.nice(max(0, (19 if priority == 'idle' else nice_level) - os.nice(0)))
+            return True
+    except (OSError, AttributeError, psutil.Error):
+        pass
+    return False
+
+def priority_ignored(priority: str, process_workers: bool) -> bool:
+    """True when apply_worker_priority will leave these workers at normal priority because they share the GIL."""
+    return priority != 'normal' and not process_workers and gil_enabled()
@@ -0,0 +1,134 @@
+import multiprocessing
+import queue
+import signal
+from typing import Any, List, Optional, Tuple
+from .affinity import pin_to_cpu
+from .nonce_dispenser import NonceDispenser
+from .priority import apply_worker_priority
+from .throttle import DutyCycleThrottle
+from .work_unit import run_work_unit
+
+def _hash_worker(worker_id: int, conn, result_queue, generation, hash_slots, dispenser: NonceDispenser, batch_size: int,
+                 cpu: Optional[int] = None, priority: str = 'normal', nice_level: int = 10):
+    """
+    Worker process loop. Receives a work unit per job over its pipe, hashes it with
+    run_work_unit against the shared dispenser and `hash_slots` array, and reports solutions,
+    errors and completion on the shared result queue. One CPU throttle lives as long as the process.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # The parent handles Ctrl+C and stops the workers
+    pin_to_cpu(cpu)
+    apply_worker_priority(priority, nice_level, process_worker=True)
+    throttle = DutyCycleThrottle(100) # CPU_LIMIT arrives with each unit
+    while True:
+        try:
+            unit = conn.recv()
+        except (EOFError, OSError):
+            break
+        if unit is None: # Shutdown request
+            break
+
+        job_id = unit['job_id']
+        hashes_computed = 0
+        def report(result, job_id=job_id):
+            result_queue.put(('solution', worker_id, job_id, result))
+        try:
+            hashes_computed = run_work_unit(unit, worker_id, generation, dispenser, batch_size, hash_slots, report, throttle)
+        except Exception as e:
+            result_queue.put(('error', worker_id, job_id, str(e)))
+        result_queue.put(('done', worker_id, job_id, hashes_computed))
+
+class ProcessMiningBackend:
+    """
+    Persistent pool of hashing processes, so hashing is not serialized by the GIL.
+    Work units are handed out over one pipe per worker and results come back on a shared queue.
+    """
+    def __init__(self, workers: int, batch_size: int, cpus: Optional[List[Optional[int]]] = None,
+                 priority: str = 'normal', nice_level: int = 10):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.cpus = cpus or [None] * workers # CPU each process is pinned to, None = not pinned
+        self.priority = priority
+        self.nice_level = nice_level
+        self.current_job = 0
+        self._context = multiprocessing.get_context()
+        self._result_queue = None
+        self._generation = None # Shared job id, 0 means no active job
+        self.hash_slots = None # Shared per-worker hash counters
+        self.dispenser = None # Shared nonce dispenser
+        self._connections = []
+        self._processes = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._processes)
+
+    def start(self):
+        """Spawns the worker processes."""
+        self._result_queue = self._context.Queue()
+        self._generation = self._context.RawValue('q', 0)
+        self.hash_slots = self._context.RawArray('q', self.workers)
+        self.dispenser = NonceDispenser.shared(self._context)
+        for worker_id in range(self.workers):
+            parent_conn, child_conn = self._context.Pipe()
+            process = self._context.Process(
+                target=_hash_worker,
+                args=(worker_id, child_conn, self._result_queue, self._generation, self.hash_slots, self.dispenser, self.batch_size,
+                      self.cpus[worker_id], self.priority, self.nice_level),
+                name=f"phonesium-hash-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def start_job(self, block_data: str, algorithm: str, kernel: str, difficulty: int, nonce_count: int,
+                  cpu_limit: int, max_extranonce: int = 0, continuous: bool = False, difficulty_mode: str = 'hex') -> int:
+        """Opens nonces [0, nonce_count) in the dispenser, sends the unit to every worker and returns the new job id."""
+        self.current_job += 1
+        self.dispenser.reset(self.current_job, 0, nonce_count, max_extranonce)
+        self._generation.value = self.current_job
+        for conn in self._connections:
+            conn.send({
+                'job_id': self.current_job,
+                'block_data': block_data,
+                'algorithm': algorithm,
+                'kernel': kernel,
+                'difficulty': difficulty,
+                'difficulty_mode': difficulty_mode,
+                'cpu_limit': cpu_limit,
+                'continuous': continuous # Keep searching after a solution
+            })
+        return self.current_job
+
+    def cancel_job(self):
+        """Makes every worker drop its current unit at the next nonce block."""
+        if self._generation is not None:
+            self._generation.value = 0
+
+    def get_message(self, timeout: float) -> Optional[Tuple[str, int, int, Any]]:
+        """Returns the next (kind, worker_id, job_id, payload) message, or None on timeout."""
+        try:
+            return self._result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def shutdown(self):
+        """Stops and joins all worker processes."""
+        self.cancel_job()
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for process in self._processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._processes = []
+        if self._result_queue is not None:
+            self._result_queue.close()
+            self._result_queue = None
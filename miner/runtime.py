@@ -0,0 +1,29 @@
+import sys
+
+# Hashing backends for MINING_BACKEND; 'auto' picks threads on a free-threaded interpreter, processes otherwise
+BACKENDS = ('auto', 'thread', 'process')
+
+def gil_enabled() -> bool:
+    """
+    False only on a free-threaded (3.13t+) interpreter that is running with the GIL disabled.
+    Importing an extension module that does not support free threading re-enables the GIL at
+    runtime, so this is checked when a pool is built rather than once at startup.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+def validate_backend(backend: str) -> str:
+    """Normalizes a MINING_BACKEND value. Raises ValueError for unknown values."""
+    backend = backend.strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Invalid backend '{backend}' (use {', '.join(BACKENDS)})")
+    return backend
+
+def resolve_backend(backend: str) -> str:
+    """
+    The backend to actually run: shared-memory threads scale across cores once the GIL is
+    gone and skip the IPC of worker processes, which remain the choice everywhere else.
+    """
+    if backend == 'auto':
+        return 'process' if gil_enabled() else 'thread'
+    return backend
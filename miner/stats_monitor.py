@@ -2,19 +2,41 @@ import time
 import threading
 import psutil
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .logger import Logger # Adjusted import
 from .config import MinerConfig # Adjusted import
 from .session_manager import SessionManager # Adjusted import
+from .hash_counter import HashCounter
+from .hash_rate_meter import HashRateMeter
+from .target import format_difficulty
 
 class StatsMonitor:
     """Monitors system performance and displays mining statistics."""
-    def __init__(self, config: MinerConfig, logger: Logger, stats_lock: threading.Lock, stats: Dict[str, Any]):
+    def __init__(self, config: MinerConfig, logger: Logger, stats_lock: threading.Lock, stats: Dict[str, Any],
+                 hash_counter: Optional[HashCounter] = None, hash_rate_meter: Optional[HashRateMeter] = None):
         self.config = config
         self.logger = logger
         self.stats_lock = stats_lock
         self.stats = stats # Shared stats dictionary
+        self.hash_counter = hash_counter # Per-worker hash counts, aggregated into stats['total_hashes'] on read
+        self.hash_rate_meter = hash_rate_meter # Windowed hash rates, copied into stats on read
         self.running = False # Controlled by the main app
+        self._process = psutil.Process()
+        self._children = {} # Worker processes by pid, kept so cpu_percent() has a previous sample
+
+    def miner_cpu_percent(self) -> float:
+        """CPU used by this process and its worker processes since the last call, in percent of one core."""
+        total = self._process.cpu_percent()
+        children = {}
+        for child in self._process.children():
+            child = self._children.get(child.pid, child)
+            try:
+                total += child.cpu_percent()
+                children[child.pid] = child
+            except psutil.Error:
+                pass
+        self._children = children
+        return total
 
     def monitor_system_performance(self):
         """Background thread to monitor CPU and memory usage."""
@@ -24,14 +46,18 @@ class StatsMonitor:
                 memory = psutil.virtual_memory()
                 memory_percent = memory.percent
                 
+                # The hashing workers hold CPU_LIMIT themselves (DutyCycleThrottle); this only measures it
+                worker_cpu = self.miner_cpu_percent() / max(self.config.threads, 1)
+                
+                self.refresh_hash_total()
                 with self.stats_lock:
                     self.stats['cpu_usage'] = cpu_percent
+                    self.stats['worker_cpu_percent'] = worker_cpu
                     self.stats['memory_usage'] = memory_percent
                     self.stats['session_uptime'] = time.time() - self.stats['start_time']
                     
-                if cpu_percent > self.config.cpu_limit:
-                    self.logger.log('WARNING', f"High CPU usage ({cpu_percent:.1f}%), throttling...")
-                    time.sleep(1)
+                if worker_cpu > self.config.cpu_limit + 10:
+                    self.logger.log('WARNING', f"Mining workers at {worker_cpu:.1f}% CPU each, above the {self.config.cpu_limit}% limit")
                     
                 if memory_percent > 90:
                     self.logger.log('WARNING', f"High memory usage ({memory_percent:.1f}%)")
@@ -42,8 +68,25 @@ class StatsMonitor:
                 self.logger.log('DEBUG', f"Performance monitoring error: {e}")
                 time.sleep(10)
 
+    def refresh_hash_total(self):
+        """Copies the aggregated per-worker hash count and the windowed hash rates into stats."""
+        if self.hash_counter is not None:
+            total_hashes = self.hash_counter.total()
+            with self.stats_lock:
+                self.stats['total_hashes'] = total_hashes
+        if self.hash_rate_meter is not None:
+            rates = self.hash_rate_meter.sample()
+            worker_rates = self.hash_rate_meter.worker_rates('60s')
+            with self.stats_lock:
+                self.stats['hash_rate'] = rates['10s']
+                self.stats['hash_rate_60s'] = rates['60s']
+                self.stats['hash_rate_15m'] = rates['15m']
+                self.stats['worker_hash_rates'] = worker_rates
+                self.stats['best_hash_rate'] = max(self.stats['best_hash_rate'], rates['60s'])
+
     def print_stats(self):
         """Prints comprehensive mining statistics to the console."""
+        self.refresh_hash_total()
         with self.stats_lock:
             elapsed = time.time() - self.stats['start_time']
             avg_hash_rate = self.stats['total_hashes'] / elapsed if elapsed > 0 else 0
@@ -56,7 +99,8 @@ class StatsMonitor:
             print(f"👤 Miner: {self.stats['username']} (ID: {self.stats['user_id']})")
             print(f"⏱️  Runtime: {elapsed:.0f}s ({elapsed/3600:.1f}h)")
             print(f"🧵 Threads: {self.config.threads} | CPU: {self.stats['cpu_usage']:.1f}% | RAM: {self.stats['memory_usage']:.1f}%")
-            print(f"💎 Difficulty: {self.config.difficulty} leading zeros")
+            print(f"🎯 Worker CPU: {self.stats['worker_cpu_percent']:.1f}% each (limit {self.config.cpu_limit}%)")
+            print(f"💎 Difficulty: {format_difficulty(self.config.difficulty, self.config.difficulty_mode)}")
             print(f"{'='*70}")
             print(f"📈 MINING PERFORMANCE")
             print(f"💎 Blocks Accepted: {self.stats['accepted_blocks']}")
@@ -64,10 +108,15 @@ class StatsMonitor:
             print(f"🌐 Network Errors: {self.stats['network_errors']}")
             print(f"✅ Success Rate: {success_rate:.1f}%")
             print(f"🔢 Total Hashes: {self.stats['total_hashes']:,}")
-            print(f"⚡ Current Rate: {self.stats['hash_rate']:.0f} H/s")
+            print(f"⚡ Current Rate: {self.stats['hash_rate']:.0f} H/s (10s) | {self.stats['hash_rate_60s']:.0f} H/s (60s) | {self.stats['hash_rate_15m']:.0f} H/s (15m)")
+            if self.stats['worker_hash_rates']:
+                print(f"🧮 Per Worker (60s): {' | '.join(f'{rate:.0f}' for rate in self.stats['worker_hash_rates'])} H/s")
             print(f"🚀 Average Rate: {avg_hash_rate:.0f} H/s")
             print(f"🏆 Best Rate: {self.stats['best_hash_rate']:.0f} H/s")
             print(f"⏰ Avg Block Time: {self.stats['average_block_time']:.0f}s")
+            print(f"🛑 Stop Latency: {self.stats['stop_latency_ms']:.1f}ms (max {self.stats['max_stop_latency_ms']:.1f}ms)")
+            print(f"🔁 Duplicate Hashes: {self.stats['duplicate_hashes']:,} | Worker Idle: {self.stats['worker_idle_seconds']:.1f}s | Extranonce Rolls: {self.stats['extranonce_rolls']:,}")
+            print(f"📤 Submit Queue: {self.stats['submit_queue_depth']} | Latency: {self.stats['submit_latency_ms']:.0f}ms (max {self.stats['max_submit_latency_ms']:.0f}ms) | Dropped: {self.stats['submit_drops']}")
             print(f"🔋 Power Level: {self.stats['power_level'].upper()}")
             print(f"{'='*70}")
             print(f"💰 EARNINGS")
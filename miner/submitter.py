@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+from .api_handler import ApiHandler
+from .config import MinerConfig
+from .hash_rate_meter import HashRateMeter
+from .logger import Logger
+from .session_manager import SessionManager
+
+class BlockSubmitter:
+    """
+    Submits found blocks from a background thread, so the mining loop can start the next job
+    as soon as a solution is queued. The queue is bounded: when it is full the oldest pending
+    solution (the one most likely to be stale) is dropped and counted.
+    """
+    MAX_CONSECUTIVE_FAILURES = 5
+
+    def __init__(self, config: MinerConfig, logger: Logger, api_handler: ApiHandler, session_manager: SessionManager,
+                 stats_lock: threading.Lock, stats: Dict[str, Any], hash_rate_meter: Optional[HashRateMeter] = None):
+        self.config = config
+        self.logger = logger
+        self.api_handler = api_handler
+        self.session_manager = session_manager
+        self.stats_lock = stats_lock
+        self.stats = stats # Shared stats dictionary
+        self.hash_rate_meter = hash_rate_meter # Source of the hash rate reported to the server
+        self.consecutive_failures = 0
+        self._queue = queue.Queue(maxsize=config.submit_queue_size)
+        self._thread = None
+
+    def start(self):
+        """Starts the submission thread."""
+        self._thread = threading.Thread(target=self._submit_loop, name="phonesium-submitter", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, user_id: int, username: str, result: Dict[str, Any], system_info: Dict[str, Any]):
+        """Queues a solution for submission without blocking the caller; it carries the difficulty it was mined at."""
+        item = (time.time(), user_id, username, result, system_info)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    continue
+                with self.stats_lock:
+                    self.stats['submit_drops'] += 1
+                self.logger.log('WARNING', "Submission queue full, dropped the oldest pending block")
+        self._update_depth()
+
+    def _update_depth(self):
+        with self.stats_lock:
+            self.stats['submit_queue_depth'] = self._queue.qsize()
+
+    def _submit_loop(self):
+        """Drains the queue until a shutdown request (None) arrives."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                self._submit(*item)
+            except Exception as e:
+                self.logger.log('ERROR', f"Block submission error: {e}")
+            finally:
+                self._queue.task_done()
+                self._update_depth()
+
+    def _submit(self, queued_at: float, user_id: int, username: str, result: Dict[str, Any], system_info: Dict[str, Any]):
+        """Submits one block and records the outcome in stats."""
+        if self.hash_rate_meter is not None:
+            hash_rate = self.hash_rate_meter.sample()['60s']
+        else:
+            hash_rate = self.stats.get('hash_rate', 0)
+        submit_result = self.api_handler.submit_block(
+            user_id, result['hash'], result['nonce'], result['difficulty'], int(hash_rate), system_info,
+            result['difficulty_mode']
+        )
+        submit_latency_ms = (time.time() - queued_at) * 1000 # Time from solution found to server answer
+
+        with self.stats_lock:
+            self.stats['submit_latency_ms'] = submit_latency_ms
+            self.stats['max_submit_latency_ms'] = max(self.stats['max_submit_latency_ms'], submit_latency_ms)
+
+        if not submit_result.get('success'):
+            with self.stats_lock:
+                self.stats['rejected_blocks'] += 1
+                if submit_result.get('retryable', True): # Increment network errors only if retryable
+                    self.stats['network_errors'] += 1
+            self.consecutive_failures += 1
+            self.logger.log('WARNING', f"Block submission failed ({self.consecutive_failures}/{self.MAX_CONSECUTIVE_FAILURES}): {submit_result.get('error', 'Unknown')}")
+            return
+
+        self.consecutive_failures = 0
+        data = submit_result['data']
+        with self.stats_lock:
+            self.stats['accepted_blocks'] += 1
+            self.stats['blocks_mined'] += 1
+            self.stats['last_block_time'] = time.time()
+            self.stats['total_earnings'] += float(data.get('final_reward', 0))
+            self.stats['current_balance'] = float(data.get('new_balance', 0))
+            self.stats['power_level'] = data.get('power_level', 'low')
+            if self.stats['accepted_blocks'] > 1:
+                elapsed = time.time() - self.stats['start_time']
+                self.stats['average_block_time'] = elapsed / self.stats['accepted_blocks']
+            accepted = self.stats['accepted_blocks']
+            attempts = accepted + self.stats['rejected_blocks']
+
+        # Enhanced logging for accepted block
+        reward = data.get('final_reward', 0)
+        balance = data.get('new_balance', 0)
+        block_num = data.get('block_number', 0)
+        power_level = data.get('power_level', 'unknown')
+        success_rate = accepted / attempts * 100 if attempts > 0 else 100
+
+        self.logger.log('SUCCESS',
+                        f"Accepted {accepted}/{attempts} "
+                        f"({success_rate:.1f}%) ∙ +{reward} PHN ∙ Balance: {balance} PHN ∙ "
+                        f"Block #{block_num} ∙ Power: {power_level.upper()}")
+
+        self.session_manager.save_session_cache(user_id, username, self.stats)
+
+    def failing(self) -> bool:
+        """True once MAX_CONSECUTIVE_FAILURES submissions in a row were rejected."""
+        return self.consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES
+
+    def reset_failures(self):
+        self.consecutive_failures = 0
+
+    def stop(self, timeout: Optional[float] = None):
+        """Lets pending submissions finish (up to `timeout` seconds) and stops the thread."""
+        if self._thread is None:
+            return
+        deadline = time.time() + (timeout if timeout is not None else self.config.timeout)
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.1)
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=max(0.0, deadline - time.time()) + 1)
+        self._thread = None
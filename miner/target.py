@@ -0,0 +1,82 @@
+import math
+import re
+from typing import Tuple
+
+# How a difficulty value is read: leading zero hex digits (the original unit), leading zero bits,
+# or an explicit target that digests must not exceed
+DIFFICULTY_MODES = ('hex', 'bits', 'target')
+BITS_PATTERN = re.compile(r'^(\d+)(?:b|bits)$') # "22b" / "22bits"
+
+class HashTarget:
+    """
+    Difficulty target compared directly against raw digests.
+    A digest meets the target when it is <= ceiling; equal-length big-endian bytes
+    compare like the integers they encode, so no hex string is built per hash.
+    `difficulty` counts leading zero hex digits or bits, or is the target value itself,
+    depending on `mode`.
+    """
+    def __init__(self, difficulty: int, digest_size: int = 32, mode: str = 'hex'):
+        self.difficulty = max(0, difficulty) if mode != 'target' else difficulty
+        self.digest_size = digest_size
+        self.mode = mode
+        digest_bits = digest_size * 8
+        if mode == 'hex':
+            self.value = (1 << (4 * max(digest_size * 2 - self.difficulty, 0))) - 1
+        elif mode == 'bits':
+            self.value = (1 << max(digest_bits - self.difficulty, 0)) - 1
+        elif mode == 'target':
+            if not 0 < difficulty < (1 << digest_bits):
+                raise ValueError(f"Target must be between 1 and 2^{digest_bits} - 1")
+            self.value = difficulty
+        else:
+            raise ValueError(f"Invalid difficulty mode '{mode}' (use {', '.join(DIFFICULTY_MODES)})")
+        self.ceiling = self.value.to_bytes(digest_size, 'big')
+
+    @property
+    def expected_hashes(self) -> float:
+        """Average number of hashes needed to find one digest that meets the target."""
+        return (1 << (self.digest_size * 8)) / (self.value + 1)
+
+    @property
+    def zero_bits(self) -> float:
+        """Difficulty as (fractional) leading zero bits; the common unit of all modes."""
+        return math.log2(self.expected_hashes)
+
+    def is_met(self, digest: bytes) -> bool:
+        """Checks if a raw digest is at or below the target."""
+        return digest <= self.ceiling
+
+def parse_difficulty(text: str, mode: str = 'hex') -> Tuple[str, int]:
+    """
+    Parses a DIFFICULTY / --difficulty value into (mode, value): "0x..." is an explicit target,
+    otherwise a bare value is read in `mode` (hex digits in 'target' mode, so "ab" is a target)
+    and, outside 'target' mode, "22b" or "22bits" is leading zero bits.
+    Raises ValueError for malformed values.
+    """
+    text = str(text).strip().lower()
+    mode = mode.strip().lower()
+    if mode not in DIFFICULTY_MODES:
+        raise ValueError(f"Invalid difficulty mode '{mode}' (use {', '.join(DIFFICULTY_MODES)})")
+    try:
+        bits = BITS_PATTERN.match(text)
+        if text.startswith('0x'):
+            mode, value = 'target', int(text, 16)
+        elif mode == 'target':
+            value = int(text, 16)
+        elif bits:
+            mode, value = 'bits', int(bits.group(1))
+        else:
+            value = int(text)
+    except ValueError:
+        raise ValueError(f"Invalid difficulty '{text}' (use e.g. 5, 22b or 0x00000fff...)")
+    if value <= 0:
+        raise ValueError(f"Invalid difficulty '{text}' (must be positive)")
+    return mode, value
+
+def format_difficulty(difficulty: int, mode: str = 'hex') -> str:
+    """Human-readable difficulty for logs and the stats display."""
+    if mode == 'bits':
+        return f"{difficulty} zero bits"
+    if mode == 'target':
+        return f"target {difficulty:#x}"
+    return f"{difficulty} leading zeros"
@@ -0,0 +1,110 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .affinity import pin_to_cpu
+from .nonce_dispenser import NonceDispenser
+from .priority import apply_worker_priority
+from .throttle import DutyCycleThrottle
+
+class JobGeneration:
+    """Job id shared with the hashing threads; same `.value` interface as a shared multiprocessing value."""
+    def __init__(self):
+        self.value = 0 # 0 means no active job
+
+class ThreadMiningBackend:
+    """
+    Persistent pool of hashing threads owned by MinerCore and reused across jobs.
+    Each thread receives one work unit per job on its inbox, claims nonce chunks from the shared
+    dispenser and reports on a shared queue, mirroring ProcessMiningBackend so MinerCore drives
+    both the same way.
+    """
+    def __init__(self, workers: int,
+                 work_fn: Callable[[Dict[str, Any], int, JobGeneration, NonceDispenser, Callable[[Dict[str, Any]], None],
+                                    DutyCycleThrottle], Optional[Dict[str, Any]]],
+                 cpus: Optional[List[Optional[int]]] = None, priority: str = 'normal', nice_level: int = 10):
+        self.workers = workers
+        self.cpus = cpus or [None] * workers # CPU each thread is pinned to, None = not pinned
+        self.priority = priority # Applied to the hashing threads only
+        self.nice_level = nice_level
+        self.work_fn = work_fn # Hashes one unit; returns a result dict or None, or reports each solution in continuous units
+        self.current_job = 0
+        self.generation = JobGeneration()
+        self.hash_slots = [0] * workers # Per-thread hash counters, each written by one thread only
+        self.dispenser = NonceDispenser()
+        self._result_queue = queue.Queue()
+        self._inboxes = []
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        """Starts the hashing threads."""
+        for worker_id in range(self.workers):
+            inbox = queue.Queue()
+            thread = threading.Thread(target=self._worker_loop, args=(worker_id, inbox), name=f"phonesium-hash-{worker_id}", daemon=True)
+            thread.start()
+            self._inboxes.append(inbox)
+            self._threads.append(thread)
+
+    def _worker_loop(self, worker_id: int, inbox: queue.Queue):
+        """Waits for work units and hashes them until a shutdown request arrives."""
+        pin_to_cpu(self.cpus[worker_id])
+        apply_worker_priority(self.priority, self.nice_level)
+        throttle = DutyCycleThrottle(100) # Kept across jobs; CPU_LIMIT arrives with each unit
+        while True:
+            unit = inbox.get()
+            if unit is None: # Shutdown request
+                break
+            job_id = unit['job_id']
+            if self.generation.value == job_id: # Skip units of jobs that were already replaced
+                def report(result, job_id=job_id):
+                    self._result_queue.put(('solution', worker_id, job_id, result))
+                try:
+                    result = self.work_fn(unit, worker_id, self.generation, self.dispenser, report, throttle)
+                    if result:
+                        report(result)
+                except Exception as e:
+                    self._result_queue.put(('error', worker_id, job_id, str(e)))
+            self._result_queue.put(('done', worker_id, job_id, None))
+
+    def start_job(self, block_data: str, algorithm: str, kernel: str, difficulty: int, nonce_count: int,
+                  cpu_limit: int, max_extranonce: int = 0, continuous: bool = False, difficulty_mode: str = 'hex') -> int:
+        """Opens nonces [0, nonce_count) in the dispenser, wakes every thread and returns the new job id."""
+        self.current_job += 1
+        self.dispenser.reset(self.current_job, 0, nonce_count, max_extranonce)
+        self.generation.value = self.current_job
+        for inbox in self._inboxes:
+            inbox.put({
+                'job_id': self.current_job,
+                'block_data': block_data,
+                'algorithm': algorithm,
+                'kernel': kernel,
+                'difficulty': difficulty,
+                'difficulty_mode': difficulty_mode,
+                'cpu_limit': cpu_limit,
+                'continuous': continuous # Keep searching after a solution
+            })
+        return self.current_job
+
+    def cancel_job(self):
+        """Preempts the current job; threads return to their inbox and wait for the next one."""
+        self.generation.value = 0
+
+    def get_message(self, timeout: float) -> Optional[Tuple[str, int, int, Any]]:
+        """Returns the next (kind, worker_id, job_id, payload) message, or None on timeout."""
+        try:
+            return self._result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def shutdown(self):
+        """Stops and joins all hashing threads."""
+        self.cancel_job()
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._inboxes = []
+        self._threads = []
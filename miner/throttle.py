@@ -0,0 +1,52 @@
+import time
+
+class DutyCycleThrottle:
+    """
+    Closed-loop CPU throttle for one hashing worker, kept for the worker's lifetime so the window
+    spans jobs. Before each batch and when a unit ends it compares the CPU time
+    the calling thread actually used (time.thread_time) with the wall time elapsed in the
+    current window, and sleeps just long enough to bring the ratio down to cpu_limit percent.
+    Because it measures real CPU time, time lost to the GIL or to other processes counts as
+    idle and is not slept again. With cpu_limit >= 100 pace() returns immediately.
+    The sleep is taken in short slices and cut short once the job is cancelled, so throttling
+    does not add to the stop latency.
+    """
+    WINDOW = 1.0 # Seconds of history the duty cycle is averaged over
+    SLEEP_SLICE = 0.01 # Longest sleep between two checks of the job generation
+
+    def __init__(self, cpu_limit: int):
+        self.active = cpu_limit < 100
+        self.duty = max(cpu_limit, 1) / 100
+        self.measured = 1.0 # Duty cycle of the last completed window
+        self._reset()
+
+    def set_limit(self, cpu_limit: int):
+        """Applies the CPU_LIMIT of a new unit; the window only restarts when throttling is switched on."""
+        active = cpu_limit < 100
+        if active and not self.active:
+            self._reset()
+        self.active = active
+        self.duty = max(cpu_limit, 1) / 100
+
+    def _reset(self):
+        self._cpu_start = time.thread_time()
+        self._wall_start = time.monotonic()
+
+    def pace(self, generation=None, job_id: int = 0):
+        """
+        Called between batches and units; sleeps off any CPU time used beyond the duty cycle, returning
+        early once `generation` no longer holds `job_id`.
+        """
+        if not self.active:
+            return
+        cpu = time.thread_time() - self._cpu_start
+        sleep_until = self._wall_start + cpu / self.duty
+        while True:
+            remaining = sleep_until - time.monotonic()
+            if remaining <= 0 or (generation is not None and generation.value != job_id):
+                break
+            time.sleep(min(remaining, self.SLEEP_SLICE))
+        wall = time.monotonic() - self._wall_start
+        if wall >= self.WINDOW:
+            self.measured = cpu / wall
+            self._reset()
@@ -0,0 +1,71 @@
+import time
+from typing import Any, Callable, Dict, MutableSequence, Optional
+from .hash_engine import create_engine, with_extranonce
+from .hashers import resolve_hasher
+from .nonce_dispenser import NonceDispenser
+from .throttle import DutyCycleThrottle
+
+def run_work_unit(unit: Dict[str, Any], worker_id: int, generation, dispenser: NonceDispenser, batch_size: int,
+                  hash_slots: MutableSequence[int], report: Callable[[Dict[str, Any]], None],
+                  throttle: Optional[DutyCycleThrottle] = None) -> int:
+    """
+    Hashes one work unit; the loop shared by pooled threads, worker processes and standalone
+    runs. Claims batch-sized nonce chunks from `dispenser` until the job's nonce space is used
+    up, switching to the rolled template whenever the dispenser advances the extranonce, and
+    adds hash counts to this worker's own slot of `hash_slots` once per search.
+    Every solution is passed to `report`; continuous units keep searching after each one.
+    The unit is dropped at the next nonce block once `generation` no longer holds its job.
+    Pooled workers pass their own long-lived `throttle`, so CPU_LIMIT also holds when jobs
+    end before a batch does (low difficulty); CPU time left over from a unit is slept off
+    before the next one starts hashing.
+    Returns the number of hashes computed.
+    """
+    job_id = unit['job_id']
+    hashes_computed = 0
+    worker_start_time = time.time()
+    hasher = resolve_hasher(unit['algorithm'])
+    # Prefix midstate computed once per job; the kernel decides how a batch is hashed
+    engine = create_engine(unit['block_data'], hasher, unit['kernel'])
+    target_ceiling = engine.target(unit['difficulty'], unit['difficulty_mode']).ceiling
+    extranonce = 0
+    if throttle is None: # Standalone run
+        throttle = DutyCycleThrottle(unit['cpu_limit'])
+    else:
+        throttle.set_limit(unit['cpu_limit'])
+    while generation.value == job_id:
+        throttle.pace(generation, job_id)
+        chunk = dispenser.claim(job_id, batch_size)
+        if chunk is None: # Nonce space used up
+            break
+        chunk_extranonce, nonce, batch_end = chunk
+        if chunk_extranonce != extranonce: # Rolled template, only the prefix midstate is rebuilt
+            extranonce = chunk_extranonce
+            engine = create_engine(with_extranonce(unit['block_data'], extranonce), hasher, unit['kernel'])
+        while nonce < batch_end:
+            # The engine checks `generation` once per nonce block (or vector), which bounds the stop latency
+            found_nonce, stop_nonce = engine.search(nonce, batch_end, target_ceiling, generation, job_id)
+            hashes_computed += stop_nonce - nonce
+            hash_slots[worker_id] += stop_nonce - nonce
+            if found_nonce is None: # Batch done or job preempted
+                break
+
+            worker_time = time.time() - worker_start_time
+            report({
+                'hash': engine.hexdigest(found_nonce), # Hex string is only built for the winner
+                'nonce': found_nonce,
+                'extranonce': extranonce,
+                'block_data': engine.block_data, # Template the hash was computed over
+                'thread_id': worker_id,
+                'hashes_computed': hashes_computed,
+                'thread_hash_rate': hashes_computed / worker_time if worker_time > 0 else 0,
+                'thread_time': worker_time,
+                'difficulty': unit['difficulty'], # What this job was mined at, even if auto-difficulty moved on
+                'difficulty_mode': unit['difficulty_mode']
+            })
+            if not unit['continuous']:
+                throttle.pace(generation, job_id)
+                return hashes_computed
+            nonce = stop_nonce # Keep searching the rest of the batch
+
+    throttle.pace(generation, job_id)
+    return hashes_computed
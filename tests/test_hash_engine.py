@@ -0,0 +1,84 @@
+import hashlib
+import pytest
+from miner.hash_engine import HashEngine, NonceEncoder
+from miner.hashers import HasherSpec, resolve_hasher
+
+class RecordingHash:
+    """hashlib-like object that keeps the bytes it was fed, so the exact message can be compared."""
+    digest_size = 32
+
+    def __init__(self, data: bytes = b''):
+        self.data = bytes(data)
+
+    def update(self, data):
+        self.data += bytes(data)
+
+    def copy(self):
+        return RecordingHash(self.data)
+
+    def digest(self) -> bytes:
+        return hashlib.sha256(self.data).digest()
+
+# Prefixes whose message takes 1, 2 and 3 compression blocks, with and without a nonce that
+# crosses into the next block
+PREFIXES = ['phonesium_1', 'p' * 50, 'p' * 60, 'phonesium_1700000000_4821937_123_654321' * 2, 'q' * 150]
+# Ranges across digit-count and nonce-block boundaries
+RANGES = [(0, 12), (5, 15), (95, 105), (990, 1010), (9995, 10005), (999990, 1000010), (10 ** 12 - 3, 10 ** 12 + 3)]
+
+@pytest.mark.parametrize('value', [0, 1, 9, 98, 999, 123999, 10 ** 12 - 2, 10 ** 19 - 3])
+def test_nonce_encoder_matches_format(value):
+    encoder = NonceEncoder(value)
+    for _ in range(5):
+        assert bytes(encoder.digits) == b'%d' % encoder.value
+        encoder.increment()
+    assert encoder.value == value + 5
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_iter_blocks_messages(start, end):
+    engine = HashEngine('phonesium_1', HasherSpec('recording', RecordingHash))
+    nonces = []
+    for first_nonce, block_state, suffixes in engine.iter_blocks(start, end):
+        for i, suffix in enumerate(suffixes):
+            hasher = block_state.copy()
+            hasher.update(suffix)
+            assert hasher.data == b'phonesium_1%d' % (first_nonce + i)
+            nonces.append(first_nonce + i)
+    assert nonces == list(range(start, end))
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_search_finds_first_qualifying_nonce(start, end):
+    engine = HashEngine('phonesium_1', resolve_hasher('sha256'))
+    digests = [hashlib.sha256(b'phonesium_1%d' % nonce).digest() for nonce in range(start, end)]
+    ceiling = sorted(digests)[1] # Two nonces qualify, the lower one must win
+    expected = start + min(i for i, digest in enumerate(digests) if digest <= ceiling)
+    assert engine.search(start, end, ceiling) == (expected, expected + 1)
+    assert engine.search(start, end, bytes(32)) == (None, end)
+
+class TestNumpyKernel:
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip('numpy')
+        from miner.numpy_kernel import NumpySha256Engine
+        self.engine_class = NumpySha256Engine
+
+    @pytest.mark.parametrize('prefix', PREFIXES)
+    @pytest.mark.parametrize('start, end', RANGES)
+    def test_hash_states_match_hashlib(self, prefix, start, end):
+        engine = self.engine_class(prefix)
+        nonce = start
+        while nonce < end: # hash_states takes nonces of one digit count
+            stop = min(end, 10 ** len(b'%d' % nonce))
+            state = engine.hash_states(nonce, stop - nonce)
+            for i in range(stop - nonce):
+                digest = b''.join(int(word[i]).to_bytes(4, 'big') for word in state)
+                assert digest == hashlib.sha256(prefix.encode() + b'%d' % (nonce + i)).digest()
+            nonce = stop
+
+    @pytest.mark.parametrize('prefix', PREFIXES)
+    @pytest.mark.parametrize('start, end', RANGES)
+    def test_search_matches_hashlib_engine(self, prefix, start, end):
+        engine = self.engine_class(prefix)
+        reference = HashEngine(prefix)
+        digests = sorted(reference.hash_nonce(nonce).digest() for nonce in range(start, end))
+        for ceiling in (digests[0], digests[len(digests) // 2], bytes(32)):
+            assert engine.search(start, end, ceiling) == reference.search(start, end, ceiling)
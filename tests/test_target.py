@@ -0,0 +1,63 @@
+import pytest
+from miner.target import HashTarget, parse_difficulty
+
+@pytest.mark.parametrize('text, mode, expected', [
+    ('5', 'hex', ('hex', 5)),
+    ('22b', 'hex', ('bits', 22)),
+    ('22bits', 'hex', ('bits', 22)),
+    (' 22B ', 'hex', ('bits', 22)),
+    ('22', 'bits', ('bits', 22)),
+    ('0x00ff', 'hex', ('target', 0xff)),
+    ('0x00ff', 'bits', ('target', 0xff)),
+    ('00ff', 'target', ('target', 0xff)),
+    ('1b', 'target', ('target', 0x1b)), # Bare hex in 'target' mode, not bits
+    ('ab', 'target', ('target', 0xab)),
+])
+def test_parse_difficulty(text, mode, expected):
+    assert parse_difficulty(text, mode) == expected
+
+@pytest.mark.parametrize('text, mode', [
+    ('ab', 'hex'), ('b', 'hex'), ('bits', 'bits'), ('2bitsb', 'hex'), ('22t', 'hex'),
+    ('0', 'hex'), ('0b', 'bits'), ('0x0', 'target'), ('', 'hex'), ('5', 'zeros'),
+])
+def test_parse_difficulty_rejects(text, mode):
+    with pytest.raises(ValueError):
+        parse_difficulty(text, mode)
+
+def test_hex_target():
+    target = HashTarget(4, 32, 'hex')
+    assert target.value == (1 << 240) - 1
+    assert target.ceiling == b'\x00\x00' + b'\xff' * 30
+    assert target.zero_bits == pytest.approx(16)
+    assert target.is_met(b'\x00\x00\xff' + b'\x00' * 29)
+    assert not target.is_met(b'\x00\x01' + b'\x00' * 30)
+
+def test_bits_target():
+    target = HashTarget(12, 32, 'bits')
+    assert target.value == (1 << 244) - 1
+    assert target.expected_hashes == pytest.approx(4096)
+    assert target.is_met(b'\x00\x0f' + b'\xff' * 30)
+    assert not target.is_met(b'\x00\x10' + b'\x00' * 30)
+
+def test_explicit_target():
+    value = 0x00000fff << 224
+    target = HashTarget(value, 32, 'target')
+    assert target.value == value
+    assert target.ceiling == value.to_bytes(32, 'big')
+    assert target.is_met(target.ceiling)
+    assert not target.is_met((value + 1).to_bytes(32, 'big'))
+
+@pytest.mark.parametrize('value', [0, 1 << 256])
+def test_explicit_target_out_of_range(value):
+    with pytest.raises(ValueError):
+        HashTarget(value, 32, 'target')
+
+def test_modes_agree():
+    # 4 hex digits, 16 bits and the equivalent explicit target are the same difficulty
+    hex_target = HashTarget(4, 32, 'hex')
+    assert HashTarget(16, 32, 'bits').ceiling == hex_target.ceiling
+    assert HashTarget(hex_target.value, 32, 'target').ceiling == hex_target.ceiling
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        HashTarget(4, 32, 'zeros')